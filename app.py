@@ -3,13 +3,33 @@ Marathi Translation API with AI4Bharat IndicTrans2
 High-quality translation service for English <-> Marathi
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g
 from flask_cors import CORS
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from werkzeug.middleware.proxy_fix import ProxyFix
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
 from pathlib import Path
+from array import array
+from collections import deque, OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from html.parser import HTMLParser
 import os
+import sys
+import gc
+import hashlib
+import html
 import json
-import torch
+import marshal
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import uuid
+
+# torch and transformers are imported by load_model(), so the app module and
+# requests that do not need the model (/, /languages, /metrics) stay cheap
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -18,9 +38,208 @@ CORS(app)  # Enable CORS for all routes
 # Global variables
 model = None
 tokenizer = None
-MODEL_DIR = Path("models/indictrans2-en-mr")
-translations_dict = None
-device = "cuda" if torch.cuda.is_available() else "cpu"
+backend = None
+MODEL_DIR = Path("models/indictrans2-en-mr")  # en→indic, the default model
+glossary = None
+DICT_PATH = Path(os.environ.get('TRANSLATIONS_DICT', 'translations_dict.json'))
+DICT_INDEX_PATH = DICT_PATH.with_suffix('.idx')  # built by scripts/compile_dict.py
+DICT_WATCH_SECONDS = float(os.environ.get('DICT_WATCH_SECONDS', 5))  # 0 disables the file watch
+device = None  # set by load_model()
+
+# Seconds spent in each startup stage, printed after load_model() and shown on /stats
+startup_timings = {}
+
+# Dynamic int8 quantization of Linear layers for CPU inference ("int8" or empty)
+QUANTIZE = os.environ.get('QUANTIZE', '').lower()
+QUANTIZE_CACHE = os.environ.get('QUANTIZE_CACHE', '1') != '0'  # keep quantized weights on disk
+QUANTIZED_WEIGHTS_NAME = "quantized-int8.pt"  # saved next to each checkpoint
+
+# Inference engine: "torch" or "onnx" (export with scripts/export_onnx.py)
+INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'torch').lower()
+ONNX_DIR = Path(os.environ.get('ONNX_DIR', str(MODEL_DIR / "onnx")))
+ONNX_THREADS = int(os.environ.get('ONNX_THREADS', 0))  # 0 lets ONNX Runtime decide
+
+# Checkpoint per translation direction, loaded on first use; a direction
+# without a checkpoint falls back to the default model
+MODEL_DIRS = {
+    "en-indic": MODEL_DIR,
+    "indic-en": Path(os.environ.get('INDIC_EN_MODEL_DIR', 'models/indictrans2-mr-en'))
+}
+DEFAULT_DIRECTION = "en-indic"
+MODEL_VARIANT = "onnx" if INFERENCE_BACKEND == "onnx" else ("int8" if QUANTIZE == "int8" else "fp32")
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get('MODEL_MEMORY_BUDGET_MB', 0))  # 0 = no limit
+
+# IndicTrans2 text pre/post-processing (normalization, tokenization, placeholders)
+INDICTRANS_PROCESSING = os.environ.get('INDICTRANS_PROCESSING', '1') != '0'
+PROCESSING_CACHE_SIZE = int(os.environ.get('PROCESSING_CACHE_SIZE', 65536))  # strings per direction of the stage
+
+# Micro-batching: flush when either limit is reached
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 16))
+BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', 10))
+BATCH_MAX_TOKENS = int(os.environ.get('BATCH_MAX_TOKENS', 8192))  # padded tokens per batch
+MAX_INPUT_TOKENS = 256
+SEGMENT_TOKEN_MARGIN = 8  # room for language tags and end of sentence
+DEFAULT_NUM_BEAMS = 4
+
+# Adaptive decoding: requests pick a quality tier ("auto" scales beams with
+# input length), the output cap follows the source length, and beams are
+# halved when the scheduler queue backs up
+QUALITY_BEAMS = {"fast": 1, "balanced": 2, "best": DEFAULT_NUM_BEAMS}
+DEFAULT_QUALITY = os.environ.get('DEFAULT_QUALITY', 'auto')
+SHORT_INPUT_TOKENS = int(os.environ.get('SHORT_INPUT_TOKENS', 8))  # "auto" uses 2 beams up to this length
+OUTPUT_LENGTH_RATIO = float(os.environ.get('OUTPUT_LENGTH_RATIO', 2.0))
+OUTPUT_LENGTH_SLACK = int(os.environ.get('OUTPUT_LENGTH_SLACK', 16))
+LOAD_DOWNGRADE_DEPTH = int(os.environ.get('LOAD_DOWNGRADE_DEPTH', BATCH_MAX_SIZE * 4))
+
+# Admission control: interactive requests are rejected with 429 and
+# Retry-After when the scheduler queue is full or the estimated wait for it
+# exceeds the budget, and each client may only run so many /translate
+# requests at once. 0 disables a limit.
+QUEUE_MAX_DEPTH = int(os.environ.get('QUEUE_MAX_DEPTH', BATCH_MAX_SIZE * 32))
+QUEUE_MAX_WAIT_MS = float(os.environ.get('QUEUE_MAX_WAIT_MS', 10000))
+# Clients are the keys listed in API_KEYS (comma separated); requests without
+# a listed key count against their address, which behind a proxy is only
+# theirs with TRUSTED_PROXY_HOPS set. The limit is per process: under gunicorn
+# each worker enforces it separately, so keep it below WORKER_THREADS.
+# Off by default.
+API_KEYS = {key.strip() for key in os.environ.get('API_KEYS', '').split(',') if key.strip()}
+API_KEY_MAX_CONCURRENCY = int(os.environ.get('API_KEY_MAX_CONCURRENCY', 0))
+# Proxies in front of the app whose X-Forwarded-For is trusted (e.g. 1 on
+# Render or HF Spaces); 0 uses the socket address
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+
+# Deadline for /translate requests without a timeout_ms of their own (0 = none).
+# Queued work past its deadline is dropped and generate stops early once
+# nobody in the batch is waiting any more.
+REQUEST_TIMEOUT_MS = float(os.environ.get('REQUEST_TIMEOUT_MS', 30000))
+
+# Streaming /translate responses queue this many list items at a time
+STREAM_WINDOW = int(os.environ.get('STREAM_WINDOW', BATCH_MAX_SIZE * 4))
+
+# Bulk /jobs: persistent queue and background workers at bulk priority
+JOBS_DIR = os.environ.get('JOBS_DIR', 'jobs')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 1))  # per process; 0 disables job processing
+JOB_BATCH_SIZE = int(os.environ.get('JOB_BATCH_SIZE', 64))
+JOB_MAX_ITEMS = int(os.environ.get('JOB_MAX_ITEMS', 100000))
+JOB_STALE_SECONDS = float(os.environ.get('JOB_STALE_SECONDS', 300))  # running jobs without progress are reclaimed
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 2))
+# Finished (completed, failed, cancelled) jobs and their results are deleted
+# this long after they finished; 0 keeps them forever
+JOB_RETENTION_SECONDS = float(os.environ.get('JOB_RETENTION_SECONDS', 7 * 24 * 3600))
+JOB_MAX_ACTIVE_PER_CLIENT = int(os.environ.get('JOB_MAX_ACTIVE_PER_CLIENT', 4))  # queued or running; 0 = no limit
+
+# In-process translation cache (0 entries disables it, 0 TTL never expires)
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 10000))
+CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', 0))
+
+# Persistent translation cache shared by all workers (disabled unless CACHE_DIR is set);
+# entries are keyed by model variant, checkpoint and INDICTRANS_PROCESSING
+CACHE_DIR = os.environ.get('CACHE_DIR')
+PERSISTENT_CACHE_MAX_BYTES = int(os.environ.get('PERSISTENT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+PERSISTENT_CACHE_FLUSH_SECONDS = float(os.environ.get('PERSISTENT_CACHE_FLUSH_SECONDS', 1.0))
+
+# Required by /admin endpoints; without it they only answer loopback requests
+ADMIN_API_KEY = os.environ.get('ADMIN_API_KEY')
+
+# /health fails when a queued sentence has waited this long (e.g. a stuck generate)
+HEALTH_STALL_SECONDS = float(os.environ.get('HEALTH_STALL_SECONDS', 120))
+
+# Prometheus metrics. Under gunicorn set PROMETHEUS_MULTIPROC_DIR so /metrics
+# aggregates every worker (see scripts/gunicorn_conf.py).
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+REQUEST_SECONDS = Histogram(
+    "translate_request_duration_seconds", "HTTP request latency", ["endpoint"], buckets=LATENCY_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    "translate_stage_duration_seconds", "Time spent in each pipeline stage", ["stage"], buckets=LATENCY_BUCKETS
+)
+DICTIONARY_SECONDS = STAGE_SECONDS.labels("dictionary")
+TOKENIZE_SECONDS = STAGE_SECONDS.labels("tokenize")
+GENERATE_SECONDS = STAGE_SECONDS.labels("generate")
+DECODE_SECONDS = STAGE_SECONDS.labels("decode")
+PREPROCESS_SECONDS = STAGE_SECONDS.labels("preprocess")
+POSTPROCESS_SECONDS = STAGE_SECONDS.labels("postprocess")
+TEXTS_TOTAL = Counter("translate_texts_total", "Texts translated, by what answered them", ["path"])
+MODEL_CALLS_TOTAL = Counter("translate_model_calls_total", "model.generate calls")
+TOKENS_TOTAL = Counter("translate_tokens_total", "Tokens in model inputs and outputs", ["direction"])
+BATCH_SIZE = Histogram(
+    "translate_batch_size", "Sentences per model.generate call", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+CACHE_LOOKUPS_TOTAL = Counter("translate_cache_lookups_total", "Translation cache lookups", ["result"])
+ERRORS_TOTAL = Counter("translate_errors_total", "Failed translations and error responses", ["kind"])
+REJECTED_TOTAL = Counter("translate_rejected_total", "Requests rejected by admission control", ["reason"])
+EXPIRED_TOTAL = Counter(
+    "translate_expired_items_total", "Sentences dropped after their deadline passed or their requests went away", ["stage"]
+)
+WASTED_SECONDS = Counter(
+    "translate_wasted_generate_seconds_total", "Generate time spent on sentences nobody was waiting for any more"
+)
+TRUNCATED_TOTAL = Counter("translate_truncated_inputs_total", "Model inputs cut off at MAX_INPUT_TOKENS")
+
+# The model runs one batch at a time; the tokenizer is not safe to share across threads
+model_lock = threading.Lock()
+tokenizer_lock = threading.Lock()
+
+# Wall clock time of the last successful model.generate call
+last_inference_at = None
+
+class ForkSafeThread:
+    """
+    Daemon thread(s) running target, started lazily in each process.
+    
+    Threads do not survive fork() (e.g. gunicorn --preload), so
+    ensure_started() starts them again in a process that has none of its
+    own. With restart, threads that died are replaced as well; without it
+    target runs once per process.
+    """
+    
+    def __init__(self, target, name, count=1, restart=True):
+        self.target = target
+        self.name = name
+        self.count = count
+        self.restart = restart
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def running(self):
+        if self._pid != os.getpid():
+            return False
+        return not self.restart or all(thread.is_alive() for thread in self._threads)
+    
+    def ensure_started(self):
+        """Start the threads unless this process already runs them, returns True if it started them"""
+        if self.running():
+            return False
+        with self._lock:
+            if self.running():
+                return False
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(
+                    target=self.target, name=self.name if self.count == 1 else f"{self.name}-{i}", daemon=True
+                )
+                for i in range(self.count)
+            ]
+            for thread in self._threads:
+                thread.start()
+            return True
+
+class ThreadConnections:
+    """SQLite connections from connect(), one per thread and process; connections must not cross fork()"""
+    
+    def __init__(self, connect):
+        self._connect = connect
+        self._local = threading.local()
+    
+    def get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
 
 # Language codes for IndicTrans2
 LANG_CODE_MAP = {
@@ -28,129 +247,2781 @@ LANG_CODE_MAP = {
     "mr": "mar_Deva"
 }
 
+# Glossary words: Latin word characters plus the Devanagari block, so vowel
+# signs and viramas stay inside the word; danda and double danda (U+0964/5)
+# are punctuation
+GLOSSARY_WORD_RE = re.compile(r'[\w\u0900-\u0963\u0966-\u097F]+')
+
+# Explicit separators between UI labels ("Save / Cancel", one label per line).
+# Phrases joined only by spaces form a sentence whose Marathi word order
+# differs ("Delete account"), so those go to the model.
+GLOSSARY_SEPARATOR_RE = re.compile(r'[/|,;·\n\u0964\u0965]')
+
+class GlossaryMatcher:
+    """
+    Word-level Aho-Corasick automaton over glossary phrases.
+    
+    Finds every glossary phrase in a text in one linear pass over its words.
+    Edges live in a single dict keyed by (node << 32 | word id) and per-node
+    data in int arrays, which keeps large glossaries compact.
+    """
+    
+    def __init__(self, phrases):
+        self._word_ids = {}
+        self._edges = {}
+        self._fail = array('i', [0])
+        self._output = array('i', [-1])  # phrase ending exactly at this node
+        self._suffix = array('i', [0])  # nearest node on the fail chain with an output
+        self._lengths = array('i')  # phrase length in words
+        self.translations = []
+        
+        children = [[]]
+        for phrase, translation in phrases.items():
+            words = self.words(phrase)
+            if not words:
+                continue
+            
+            node = 0
+            for word in words:
+                word_id = self._word_ids.setdefault(word, len(self._word_ids))
+                key = (node << 32) | word_id
+                child = self._edges.get(key)
+                if child is None:
+                    child = len(self._fail)
+                    self._edges[key] = child
+                    self._fail.append(0)
+                    self._output.append(-1)
+                    self._suffix.append(0)
+                    children.append([])
+                    children[node].append((word_id, child))
+                node = child
+            
+            if self._output[node] == -1:
+                self._output[node] = len(self.translations)
+                self._lengths.append(len(words))
+                self.translations.append(translation)
+        
+        # Breadth-first pass for failure and output links
+        queue = deque(child for _, child in children[0])
+        while queue:
+            node = queue.popleft()
+            for word_id, child in children[node]:
+                fail = self._fail[node]
+                while fail and ((fail << 32) | word_id) not in self._edges:
+                    fail = self._fail[fail]
+                fail = self._edges.get((fail << 32) | word_id, 0)
+                self._fail[child] = fail
+                self._suffix[child] = fail if self._output[fail] != -1 else self._suffix[fail]
+                queue.append(child)
+    
+    STATE_FIELDS = ("_word_ids", "_edges", "_fail", "_output", "_suffix", "_lengths", "translations")
+    ARRAY_FIELDS = ("_fail", "_output", "_suffix", "_lengths")
+    
+    def __len__(self):
+        return len(self.translations)
+    
+    def to_state(self):
+        """Plain-data snapshot for the precompiled index (dicts, lists, str, int and bytes only)"""
+        state = {field: getattr(self, field) for field in self.STATE_FIELDS}
+        for field in self.ARRAY_FIELDS:
+            state[field] = state[field].tobytes()
+        return state
+    
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a matcher from to_state() output, raises ValueError if it is malformed"""
+        matcher = cls.__new__(cls)
+        for field in cls.STATE_FIELDS:
+            value = state[field]
+            if field in cls.ARRAY_FIELDS:
+                value = array('i', value)
+            setattr(matcher, field, value)
+        
+        nodes = len(matcher._fail)
+        if not (
+            isinstance(matcher._word_ids, dict) and isinstance(matcher._edges, dict)
+            and isinstance(matcher.translations, list) and nodes
+            and len(matcher._output) == len(matcher._suffix) == nodes
+            and len(matcher._lengths) == len(matcher.translations)
+        ):
+            raise ValueError("Malformed glossary matcher state")
+        return matcher
+    
+    @staticmethod
+    def words(text):
+        return GLOSSARY_WORD_RE.findall(text.lower())
+    
+    def _match(self, lowered, spans):
+        """Yield (first word, last word, phrase index) for all occurrences"""
+        node = 0
+        for i, (start, end) in enumerate(spans):
+            word_id = self._word_ids.get(lowered[start:end])
+            if word_id is None:
+                node = 0
+                continue
+            
+            while node and ((node << 32) | word_id) not in self._edges:
+                node = self._fail[node]
+            node = self._edges.get((node << 32) | word_id, 0)
+            
+            out = node if self._output[node] != -1 else self._suffix[node]
+            while out:
+                phrase = self._output[out]
+                yield i - self._lengths[phrase] + 1, i, phrase
+                out = self._suffix[out]
+    
+    def translate_covered(self, text):
+        """
+        Translate text by phrase substitution if glossary phrases cover every
+        word and every gap between two phrases holds an explicit separator,
+        e.g. "Save / Cancel". Text between phrases is kept as is. Returns
+        None when any word is uncovered or phrases are only space-separated.
+        """
+        lowered = text.lower()
+        spans = [m.span() for m in GLOSSARY_WORD_RE.finditer(lowered)]
+        if not spans:
+            return None
+        
+        # best[i]: fewest phrases covering words [0, i); choice[i]: last phrase used
+        n = len(spans)
+        best = [0] + [None] * n
+        choice = [None] * (n + 1)
+        matches_by_end = {}
+        for first, last, phrase in self._match(lowered, spans):
+            matches_by_end.setdefault(last + 1, []).append((first, phrase))
+        
+        # Phrases may only start at the text start or after a separator
+        separated = [True] + [
+            bool(GLOSSARY_SEPARATOR_RE.search(text[spans[i - 1][1]:spans[i][0]])) for i in range(1, n)
+        ]
+        
+        for end in range(1, n + 1):
+            for first, phrase in matches_by_end.get(end, ()):
+                if not separated[first]:
+                    continue
+                if best[first] is not None and (best[end] is None or best[first] + 1 < best[end]):
+                    best[end] = best[first] + 1
+                    choice[end] = (first, phrase)
+        
+        if best[n] is None:
+            return None
+        
+        parts = []
+        end = n
+        while end:
+            first, phrase = choice[end]
+            parts.append(text[spans[end - 1][1]:spans[end][0]] if end < n else text[spans[-1][1]:])
+            parts.append(self.translations[phrase])
+            end = first
+        parts.append(text[:spans[0][0]])
+        return "".join(reversed(parts)).strip()
+
+class Glossary:
+    """The translations dictionary plus compiled phrase matchers per direction"""
+    
+    DIRECTIONS = {("en", "mr"): "en_to_mr", ("mr", "en"): "mr_to_en"}
+    
+    # Bump when the index layout changes so stale index files are rebuilt
+    INDEX_VERSION = 3
+    
+    def __init__(self, data, matchers=None, source=None):
+        self.data = data
+        self.matchers = matchers or {
+            direction: GlossaryMatcher(data.get(direction, {}))
+            for direction in self.DIRECTIONS.values()
+        }
+        self.source = source
+        self.loaded_at = time.time()
+    
+    @staticmethod
+    def fingerprint(dict_path):
+        """Identifies the JSON file an index was compiled from"""
+        stat = dict_path.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    def save_index(self, index_path, dict_path):
+        """Write the compiled glossary as a marshal index (atomically replaced)"""
+        state = {
+            "version": self.INDEX_VERSION,
+            "fingerprint": self.fingerprint(dict_path),
+            "data": self.data,
+            "matchers": {direction: matcher.to_state() for direction, matcher in self.matchers.items()}
+        }
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(state, f)
+        os.replace(tmp_path, index_path)
+    
+    @classmethod
+    def load_index(cls, index_path, dict_path):
+        """
+        Load a precompiled index, or None if it is missing, out of date or
+        unreadable (a foreign or corrupt file), so the JSON is compiled again
+        """
+        try:
+            with open(index_path, 'rb') as f:
+                state = marshal.load(f)
+        except OSError:
+            return None
+        except Exception as e:
+            print(f"⚠ Ignoring unreadable dictionary index {index_path}: {e}")
+            return None
+        
+        try:
+            if state.get("version") != cls.INDEX_VERSION:
+                return None
+            if dict_path.exists() and state.get("fingerprint") != cls.fingerprint(dict_path):
+                return None
+            
+            matchers = {
+                direction: GlossaryMatcher.from_state(matcher_state)
+                for direction, matcher_state in state["matchers"].items()
+            }
+            if set(matchers) != set(cls.DIRECTIONS.values()) or not isinstance(state["data"], dict):
+                raise ValueError("unexpected directions")
+            return cls(state["data"], matchers, source=str(index_path))
+        except Exception as e:
+            print(f"⚠ Ignoring invalid dictionary index {index_path}: {e}")
+            return None
+    
+    def stats(self):
+        return {
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "entries": {direction: len(entries) for direction, entries in self.data.items()},
+            "phrases": {direction: len(matcher) for direction, matcher in self.matchers.items()}
+        }
+    
+    def lookup(self, text, source, target):
+        """Exact dictionary hit, else phrase substitution if fully covered"""
+        direction = self.DIRECTIONS.get((source, target))
+        if direction is None:
+            return None
+        
+        # Normalize text for dictionary lookup
+        entries = self.data.get(direction, {})
+        translated = entries.get(text.lower().strip()) if source == "en" else entries.get(text)
+        if translated is not None:
+            return translated
+        
+        return self.matchers[direction].translate_covered(text)
+
+def build_glossary(use_index=True, write_index=True):
+    """
+    Build a Glossary from the precompiled index if it is current, else from
+    translations_dict.json (refreshing the index when possible)
+    """
+    if use_index and DICT_INDEX_PATH.exists():
+        compiled = Glossary.load_index(DICT_INDEX_PATH, DICT_PATH)
+        if compiled is not None:
+            return compiled
+    
+    if not DICT_PATH.exists():
+        print("⚠ Translations dictionary not found, using model only")
+        return Glossary({"en_to_mr": {}, "mr_to_en": {}})
+    
+    with open(DICT_PATH, 'r', encoding='utf-8') as f:
+        compiled = Glossary(json.load(f), source=str(DICT_PATH))
+    
+    if write_index:
+        try:
+            compiled.save_index(DICT_INDEX_PATH, DICT_PATH)
+        except OSError as e:
+            print(f"⚠ Could not write dictionary index: {e}")
+    return compiled
+
+def load_glossary():
+    """Return the current Glossary, loading it on first use"""
+    global glossary
+    
+    if glossary is None:
+        with glossary_lock:
+            if glossary is None:
+                with startup_stage("dictionary"):
+                    glossary = build_glossary()
+                print("✓ Translations dictionary loaded")
+    
+    dict_watcher.ensure_started()
+    return glossary
+
 def load_translations_dict():
     """Load the custom translations dictionary"""
-    global translations_dict
+    return load_glossary().data
+
+def reload_translations_dict():
+    """
+    Rebuild the glossary and swap it in atomically
+    Requests in flight keep using the glossary they already hold
+    """
+    global glossary
+    
+    started = time.monotonic()
+    with glossary_lock:
+        glossary = build_glossary()
+    elapsed_ms = (time.monotonic() - started) * 1000.0
+    print(f"✓ Translations dictionary reloaded ({elapsed_ms:.1f} ms)")
+    return elapsed_ms
+
+class DictWatcher:
+    """Polls translations_dict.json and its index, reloading on change"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._thread = ForkSafeThread(self._run, "dict-watcher")
+    
+    def _snapshot(self):
+        snapshot = []
+        for path in (DICT_PATH, DICT_INDEX_PATH):
+            try:
+                stat = path.stat()
+                snapshot.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                snapshot.append(None)
+        return snapshot
+    
+    def ensure_started(self):
+        if self.interval:
+            self._thread.ensure_started()
+    
+    def _run(self):
+        last = self._snapshot()
+        while True:
+            time.sleep(self.interval)
+            current = self._snapshot()
+            if current == last:
+                continue
+            last = current
+            try:
+                reload_translations_dict()
+                last = self._snapshot()  # our own index refresh is not a change
+            except Exception as e:
+                print(f"⚠ Dictionary reload failed, keeping the previous one: {e}")
+
+glossary_lock = threading.Lock()
+dict_watcher = DictWatcher(DICT_WATCH_SECONDS)
+
+class InferenceBackend:
+    """
+    Inference engine interface: tokenize -> generate -> detokenize.
+    
+    Backends share the HuggingFace tokenizer; generate() takes unpadded input
+    id lists and returns one output id sequence per input.
+    """
+    
+    name = None
+    
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+    
+    def tokenize(self, input_texts):
+        with tokenizer_lock:
+            return self.tokenizer(
+                input_texts,
+                truncation=True,
+                max_length=MAX_INPUT_TOKENS
+            )["input_ids"]
+    
+    def pad(self, input_ids, return_tensors):
+        with tokenizer_lock:
+            return self.tokenizer.pad(
+                {"input_ids": input_ids},
+                padding=True,
+                return_tensors=return_tensors
+            )
+    
+    def generate(self, input_ids, num_beams=DEFAULT_NUM_BEAMS, max_length=MAX_INPUT_TOKENS, should_stop=None):
+        """should_stop() is polled once per decoding step; generation ends early when it returns True"""
+        raise NotImplementedError
+    
+    def detokenize(self, output_ids):
+        with tokenizer_lock:
+            translations = self.tokenizer.batch_decode(
+                output_ids,
+                skip_special_tokens=True
+            )
+        return [translation.strip() for translation in translations]
+
+class TorchBackend(InferenceBackend):
+    """PyTorch inference through AutoModelForSeq2SeqLM.generate"""
+    
+    name = "torch"
+    
+    def generate(self, input_ids, num_beams=DEFAULT_NUM_BEAMS, max_length=MAX_INPUT_TOKENS, should_stop=None):
+        import torch
+        
+        kwargs = {}
+        if should_stop is not None:
+            kwargs["stopping_criteria"] = _stopping_criteria(should_stop)
+        
+        inputs = self.pad(input_ids, "pt").to(device)
+        with torch.no_grad():
+            return self.model.generate(
+                **inputs,
+                max_length=max_length,
+                num_beams=num_beams,
+                num_return_sequences=1,
+                early_stopping=True,
+                **kwargs
+            )
+
+def _stopping_criteria(should_stop):
+    """A transformers StoppingCriteriaList that ends every sequence once should_stop() is True"""
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+    
+    class CallbackStoppingCriteria(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            return torch.full((input_ids.shape[0],), should_stop(), dtype=torch.bool, device=input_ids.device)
+    
+    return StoppingCriteriaList([CallbackStoppingCriteria()])
+
+class OnnxSeq2Seq:
+    """
+    ONNX Runtime sessions exported by scripts/export_onnx.py: encoder,
+    decoder (first step, returns self and cross attention cache) and
+    decoder_with_past (later steps, returns the updated self attention cache)
+    """
+    
+    def __init__(self, onnx_dir, threads=0):
+        import onnxruntime as ort
+        
+        with open(onnx_dir / "export_config.json", 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        
+        def session(name):
+            return ort.InferenceSession(str(onnx_dir / name), options, providers=["CPUExecutionProvider"])
+        
+        self.encoder = session(self.config["encoder"])
+        self.decoder = session(self.config["decoder"])
+        self.decoder_with_past = session(self.config["decoder_with_past"])
+        self.num_layers = self.config["num_layers"]
+        self.nbytes = sum((onnx_dir / self.config[name]).stat().st_size for name in ("encoder", "decoder", "decoder_with_past"))
+        
+        # The exporter drops inputs a graph does not use (e.g. encoder states
+        # once the cross attention cache exists)
+        self.past_inputs = {i.name for i in self.decoder_with_past.get_inputs()}
+    
+    def eval(self):
+        return self
+
+class OnnxBackend(InferenceBackend):
+    """
+    ONNX Runtime inference with a numpy beam search over the cached decoder
+    Same stopping rules as generate(): beams end at EOS, scores are
+    length-normalized, and a sentence is done once num_beams hypotheses finished.
+    """
+    
+    name = "onnx"
+    
+    def generate(self, input_ids, num_beams=DEFAULT_NUM_BEAMS, max_length=MAX_INPUT_TOKENS, should_stop=None):
+        import numpy as np
+        
+        config = self.model.config
+        eos_id = config["eos_token_id"]
+        pad_id = config["pad_token_id"]
+        beams = max(1, num_beams)
+        
+        inputs = self.pad(input_ids, "np")
+        attention_mask = inputs["attention_mask"].astype(np.int64)
+        batch_size = attention_mask.shape[0]
+        
+        hidden = self.model.encoder.run(None, {
+            "input_ids": inputs["input_ids"].astype(np.int64),
+            "attention_mask": attention_mask
+        })[0]
+        
+        # Every sentence gets `beams` rows
+        hidden = np.repeat(hidden, beams, axis=0)
+        attention_mask = np.repeat(attention_mask, beams, axis=0)
+        tokens = np.full((batch_size * beams, 1), config["decoder_start_token_id"], dtype=np.int64)
+        scores = np.zeros((batch_size, beams), dtype=np.float32)
+        scores[:, 1:] = -1e9  # identical beams at the start; expand from the first only
+        
+        outputs = self.model.decoder.run(None, {
+            "input_ids": tokens,
+            "encoder_hidden_states": hidden,
+            "encoder_attention_mask": attention_mask
+        })
+        logits, past = outputs[0], outputs[1:]
+        self_past = [p for i, p in enumerate(past) if i % 4 < 2]
+        cross_past = [p for i, p in enumerate(past) if i % 4 >= 2]
+        
+        finished = [[] for _ in range(batch_size)]
+        done = [False] * batch_size
+        
+        for step in range(1, max_length):
+            log_probs = logits[:, -1, :].astype(np.float32)
+            log_probs = log_probs - log_probs.max(axis=-1, keepdims=True)
+            log_probs = log_probs - np.log(np.exp(log_probs).sum(axis=-1, keepdims=True))
+            vocab = log_probs.shape[-1]
+            
+            candidates = (scores.reshape(-1, 1) + log_probs).reshape(batch_size, beams * vocab)
+            top = np.argpartition(-candidates, 2 * beams - 1, axis=1)[:, :2 * beams]
+            
+            next_rows = np.zeros(batch_size * beams, dtype=np.int64)
+            next_tokens = np.full(batch_size * beams, pad_id, dtype=np.int64)
+            next_scores = np.full((batch_size, beams), -1e9, dtype=np.float32)
+            
+            for b in range(batch_size):
+                if done[b]:
+                    next_rows[b * beams:(b + 1) * beams] = b * beams
+                    continue
+                
+                kept = 0
+                for flat in top[b][np.argsort(-candidates[b, top[b]])]:
+                    beam, token = divmod(int(flat), vocab)
+                    score = float(candidates[b, flat])
+                    if token == eos_id:
+                        sequence = tokens[b * beams + beam, 1:]
+                        finished[b].append((score / (len(sequence) + 1), sequence))
+                        continue
+                    row = b * beams + kept
+                    next_rows[row] = b * beams + beam
+                    next_tokens[row] = token
+                    next_scores[b, kept] = score
+                    kept += 1
+                    if kept == beams:
+                        break
+                
+                if len(finished[b]) >= beams:
+                    done[b] = True
+            
+            if all(done) or (should_stop is not None and should_stop()):
+                break
+            
+            tokens = np.concatenate([tokens[next_rows], next_tokens[:, None]], axis=1)
+            scores = next_scores
+            self_past = [p[next_rows] for p in self_past]
+            
+            feed = {
+                "input_ids": next_tokens[:, None],
+                "encoder_hidden_states": hidden,
+                "encoder_attention_mask": attention_mask
+            }
+            for layer in range(self.model.num_layers):
+                feed[f"past_key_{layer}"] = self_past[2 * layer]
+                feed[f"past_value_{layer}"] = self_past[2 * layer + 1]
+                feed[f"cross_key_{layer}"] = cross_past[2 * layer]
+                feed[f"cross_value_{layer}"] = cross_past[2 * layer + 1]
+            outputs = self.model.decoder_with_past.run(
+                None, {name: value for name, value in feed.items() if name in self.model.past_inputs}
+            )
+            logits, self_past = outputs[0], list(outputs[1:])
+        
+        results = []
+        for b in range(batch_size):
+            if not finished[b]:
+                # Hit max_length: take the best open beam
+                best = int(np.argmax(scores[b]))
+                sequence = tokens[b * beams + best, 1:]
+                finished[b].append((scores[b, best] / max(1, len(sequence)), sequence))
+            results.append(max(finished[b], key=lambda hypothesis: hypothesis[0])[1].tolist())
+        return results
+
+def load_backend(engine_model, engine_tokenizer):
+    """Wrap the loaded model in the configured inference backend"""
+    if isinstance(engine_model, OnnxSeq2Seq):
+        return OnnxBackend(engine_model, engine_tokenizer)
+    return TorchBackend(engine_model, engine_tokenizer)
+
+def quantize_int8(fp32_model):
+    """Apply dynamic int8 quantization to the model's Linear layers"""
+    import torch
+    
+    return torch.ao.quantization.quantize_dynamic(
+        fp32_model,
+        {torch.nn.Linear},
+        dtype=torch.qint8
+    )
+
+def _load_quantized_model(model_dir):
+    """
+    Load the int8 model, reusing quantized weights saved by a previous start
+    The saved weights are only used while they are newer than the checkpoint
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM
+    
+    weights_path = model_dir / QUANTIZED_WEIGHTS_NAME
+    weights = [p for p in model_dir.glob("*") if p.suffix in (".bin", ".safetensors")]
+    cached = QUANTIZE_CACHE and weights_path.exists() and all(
+        weights_path.stat().st_mtime >= p.stat().st_mtime for p in weights
+    )
+    
+    if cached:
+        try:
+            config = AutoConfig.from_pretrained(
+                str(model_dir),
+                local_files_only=True,
+                trust_remote_code=True
+            )
+            quantized = quantize_int8(AutoModelForSeq2SeqLM.from_config(config, trust_remote_code=True).eval())
+            quantized.load_state_dict(torch.load(weights_path, map_location="cpu", mmap=True))
+            print(f"✓ Loaded quantized weights from {weights_path}")
+            return quantized
+        except Exception as e:
+            print(f"⚠ Could not load quantized weights, quantizing again: {e}")
+    
+    fp32_model = AutoModelForSeq2SeqLM.from_pretrained(
+        str(model_dir),
+        local_files_only=True,
+        trust_remote_code=True,
+        low_cpu_mem_usage=True
+    ).eval()
+    quantized = quantize_int8(fp32_model)
+    
+    if QUANTIZE_CACHE:
+        try:
+            torch.save(quantized.state_dict(), weights_path)
+        except OSError as e:
+            print(f"⚠ Could not save quantized weights: {e}")
+    return quantized
+
+@contextmanager
+def startup_stage(name, timings=None):
+    """Record how long a startup stage takes in startup_timings"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        (startup_timings if timings is None else timings)[name] = round(time.perf_counter() - started, 3)
+
+def direction_for(source_lang, target_lang):
+    """Registry direction serving a language pair"""
+    return "en-indic" if source_lang == "en" else "indic-en"
+
+def model_nbytes(engine_model):
+    """Approximate memory held by a model's weights"""
+    if isinstance(engine_model, OnnxSeq2Seq):
+        return engine_model.nbytes
+    
+    seen = set()
+    total = 0
+    pending = list(engine_model.state_dict().values())
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (tuple, list)):
+            # Packed int8 Linear parameters
+            pending.extend(value)
+        elif hasattr(value, "element_size") and value.data_ptr() not in seen:
+            # Tied weights are counted once
+            seen.add(value.data_ptr())
+            total += value.nelement() * value.element_size()
+    return total
+
+# Files that make up a tokenizer (IndicTrans2 ships dict.SRC.json, model.SRC, ...)
+TOKENIZER_FILE_PREFIXES = ("tokenizer", "tokenization_", "special_tokens_map", "added_tokens", "vocab", "dict.", "model.")
+_tokenizers = {}  # tokenizer files digest -> tokenizer
+
+def checkpoint_nbytes(model_dir, variant):
+    """Size of a checkpoint's weights on disk, the estimate used before loading it"""
+    if variant == "onnx":
+        onnx_dir = ONNX_DIR if model_dir == MODEL_DIR else model_dir / "onnx"
+        return sum(p.stat().st_size for p in onnx_dir.glob("*.onnx"))
+    if variant == "int8" and (model_dir / QUANTIZED_WEIGHTS_NAME).exists():
+        return (model_dir / QUANTIZED_WEIGHTS_NAME).stat().st_size
+    weights = [p for p in model_dir.glob("*") if p.suffix in (".bin", ".safetensors")]
+    safetensors = [p for p in weights if p.suffix == ".safetensors"]
+    return sum(p.stat().st_size for p in safetensors or weights)
+
+def model_version(direction):
+    """
+    Tag for translations produced by a direction's model: the variant, the
+    checkpoint files it loads and whether IndicTrans2 processing is on
+    Resolved on every call like the registry does, so a direction that stops
+    falling back (its checkpoint was added) gets its own tag at once.
+    """
+    return _checkpoint_version(model_registry.resolve(direction))
+
+@lru_cache(maxsize=None)
+def _checkpoint_version(direction):
+    """model_version() of the checkpoint a direction loads itself"""
+    model_dir = MODEL_DIRS[direction]
+    if MODEL_VARIANT == "onnx":
+        model_dir = ONNX_DIR if model_dir == MODEL_DIR else model_dir / "onnx"
+    digest = hashlib.sha1(f"{MODEL_VARIANT}:{int(INDICTRANS_PROCESSING)}".encode("utf-8"))
+    if model_dir.exists():
+        for path in sorted(model_dir.iterdir()):
+            if path.suffix in (".bin", ".safetensors", ".onnx") or path.name == "config.json":
+                stat = path.stat()
+                digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+def load_tokenizer(model_dir):
+    """Load a checkpoint's tokenizer, sharing one instance between checkpoints with identical tokenizer files"""
+    from transformers import AutoTokenizer
+    
+    digest = hashlib.sha1()
+    for path in sorted(model_dir.iterdir()):
+        if not path.is_file() or path.suffix in (".bin", ".safetensors", ".pt", ".onnx"):
+            continue
+        if not path.name.startswith(TOKENIZER_FILE_PREFIXES):
+            continue
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    key = digest.hexdigest()
+    
+    if key not in _tokenizers:
+        _tokenizers[key] = AutoTokenizer.from_pretrained(
+            str(model_dir),
+            local_files_only=True,
+            trust_remote_code=True
+        )
+    return _tokenizers[key]
+
+class LoadedModel:
+    """A checkpoint held by the model registry"""
+    
+    def __init__(self, direction, variant, model_dir, engine_model, engine_tokenizer, engine, load_timings):
+        self.direction = direction
+        self.variant = variant
+        self.model_dir = model_dir
+        self.model = engine_model
+        self.tokenizer = engine_tokenizer
+        self.backend = engine
+        self.nbytes = model_nbytes(engine_model)
+        self.load_timings = load_timings
+        self.loaded_at = time.time()
+    
+    def stats(self):
+        return {
+            "direction": self.direction,
+            "variant": self.variant,
+            "path": str(self.model_dir),
+            "backend": self.backend.name,
+            "mb": round(self.nbytes / (1024 * 1024), 1),
+            "load_seconds": self.load_timings,
+            "loaded_at": self.loaded_at
+        }
+
+def load_checkpoint(direction, variant=MODEL_VARIANT):
+    """Load the IndicTrans2 checkpoint for a direction and wrap it in its inference backend"""
+    global device
+    
+    model_dir = MODEL_DIRS[direction]
+    print(f"Loading IndicTrans2 model ({direction}, {variant})...")
+    
+    if not model_dir.exists():
+        raise FileNotFoundError(f"Model not found at {model_dir}. Run: python scripts/download_indictrans2.py")
+    
+    # Only the default model is part of startup; later loads keep their own timings
+    timings = startup_timings if direction == DEFAULT_DIRECTION else {}
+    try:
+        with startup_stage("imports", timings):
+            import torch
+            from transformers import AutoModelForSeq2SeqLM
+        
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        print(f"Device: {device}")
+        
+        with startup_stage("tokenizer", timings):
+            engine_tokenizer = load_tokenizer(model_dir)
+        
+        with startup_stage("weights", timings):
+            if variant == "onnx":
+                onnx_dir = ONNX_DIR if model_dir == MODEL_DIR else model_dir / "onnx"
+                if not (onnx_dir / "export_config.json").exists():
+                    raise FileNotFoundError(f"ONNX model not found at {onnx_dir}. Run: python scripts/export_onnx.py")
+                engine_model = OnnxSeq2Seq(onnx_dir, ONNX_THREADS)
+            elif variant == "int8" and device == "cpu":
+                engine_model = _load_quantized_model(model_dir)
+                print("✓ Using dynamic int8 quantization")
+            else:
+                if QUANTIZE:
+                    print(f"⚠ QUANTIZE={QUANTIZE} is only supported as int8 on CPU, using fp32")
+                if not any(model_dir.glob("*.safetensors")):
+                    print("⚠ No safetensors weights, loading the pickled checkpoint (see scripts/download_indictrans2.py)")
+                # safetensors are memory-mapped; low_cpu_mem_usage skips the
+                # random initialization that the checkpoint would overwrite
+                engine_model = AutoModelForSeq2SeqLM.from_pretrained(
+                    str(model_dir),
+                    local_files_only=True,
+                    trust_remote_code=True,
+                    low_cpu_mem_usage=True
+                ).to(device)
+        
+        engine_model.eval()  # Set to evaluation mode
+        with startup_stage("backend", timings):
+            engine = load_backend(engine_model, engine_tokenizer)
+        
+        loaded = LoadedModel(direction, variant, model_dir, engine_model, engine_tokenizer, engine, timings)
+        print(f"✓ IndicTrans2 model loaded successfully ({direction}, {engine.name} backend, {loaded.nbytes / (1024 * 1024):.0f} MB)")
+        print("  Load: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()))
+        return loaded
+    except Exception as e:
+        print(f"✗ Failed to load model: {e}")
+        raise
+
+class ModelRegistry:
+    """
+    Loaded checkpoints keyed by (direction, variant).
+    
+    Checkpoints load on first use. Before a load, the least recently used
+    models are dropped until the new checkpoint fits the memory budget, so a
+    rarely used direction only costs memory while its traffic lasts. A
+    direction without a checkpoint on disk is served by the default model.
+    """
+    
+    def __init__(self, budget_bytes=0):
+        self.budget = max(0, int(budget_bytes))
+        self._entries = OrderedDict()
+        self._load_locks = {}
+        self._lock = threading.Lock()
+        self._fallbacks = set()
+        
+        # Stats
+        self.loads = 0
+        self.evictions = 0
+    
+    def resolve(self, direction):
+        if direction != DEFAULT_DIRECTION and not MODEL_DIRS[direction].exists():
+            if direction not in self._fallbacks:
+                self._fallbacks.add(direction)
+                print(f"⚠ No {direction} model at {MODEL_DIRS[direction]}, using {MODEL_DIRS[DEFAULT_DIRECTION]}")
+            return DEFAULT_DIRECTION
+        return direction
+    
+    def is_loaded(self, direction, variant=MODEL_VARIANT):
+        with self._lock:
+            return (self.resolve(direction), variant) in self._entries
+    
+    def get(self, direction, variant=MODEL_VARIANT):
+        """Return the LoadedModel for a direction, loading it on first use"""
+        key = (self.resolve(direction), variant)
+        with self._lock:
+            loaded = self._entries.get(key)
+            if loaded is not None:
+                self._entries.move_to_end(key)
+                return loaded
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        
+        # Other directions keep serving while this one loads
+        with load_lock:
+            with self._lock:
+                loaded = self._entries.get(key)
+            if loaded is None:
+                with self._lock:
+                    evicted = self._evict(key, checkpoint_nbytes(MODEL_DIRS[key[0]], key[1]))
+                if evicted:
+                    del evicted
+                    gc.collect()
+                
+                loaded = load_checkpoint(*key)
+                with self._lock:
+                    self._entries[key] = loaded
+                    self.loads += 1
+                    self._evict(key)
+        return loaded
+    
+    def _evict(self, keep, incoming=0):
+        """Drop least recently used models until incoming bytes fit the budget"""
+        global model, tokenizer, backend
+        
+        evicted = []
+        total = sum(loaded.nbytes for loaded in self._entries.values()) + incoming
+        while self.budget and total > self.budget:
+            victim = next((key for key in self._entries if key != keep), None)
+            if victim is None:
+                break
+            loaded = self._entries.pop(victim)
+            total -= loaded.nbytes
+            evicted.append(loaded)
+            self.evictions += 1
+            if loaded.model is model:
+                # load_model() loads it again when needed
+                model, tokenizer, backend = None, None, None
+            print(f"Evicted {victim[0]} model ({victim[1]}) to stay within the model memory budget")
+        return evicted
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "models": [loaded.stats() for loaded in self._entries.values()],
+                "mb": round(sum(loaded.nbytes for loaded in self._entries.values()) / (1024 * 1024), 1),
+                "budget_mb": round(self.budget / (1024 * 1024), 1) if self.budget else None,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "fallbacks": sorted(self._fallbacks)
+            }
+
+model_registry = ModelRegistry(MODEL_MEMORY_BUDGET_MB * 1024 * 1024)
+
+def load_model():
+    """
+    Load the default (en→indic) model and its inference backend
+    Other directions are loaded by model_registry on first use
+    """
+    global model, tokenizer, backend
+    
+    if model is not None and tokenizer is not None:
+        return model, tokenizer
+    
+    loaded = model_registry.get(DEFAULT_DIRECTION)
+    model, tokenizer, backend = loaded.model, loaded.tokenizer, loaded.backend
+    return model, tokenizer
+
+# Warmup batch run once the model is loaded, so the first real requests do
+# not pay for lazy initialization (allocator, kernels, tokenizer caches)
+WARMUP_TEXTS = {
+    "en": [
+        "Hello",
+        "Please save your changes before you log out.",
+        "The driver will arrive at the pickup location in ten minutes."
+    ],
+    "mr": [
+        "नमस्कार",
+        "कृपया लॉग आउट करण्यापूर्वी तुमचे बदल जतन करा.",
+        "ड्रायव्हर दहा मिनिटांत पिकअपच्या ठिकाणी पोहोचेल."
+    ]
+}
+
+class ModelLoader:
+    """
+    Loads the dictionary and model in a background thread, then warms the
+    model up. status is loading, warming, ready or failed; /ready and /health
+    read it without blocking.
+    """
+    
+    def __init__(self):
+        self.status = "not_started"
+        self.error = None
+        self._thread = ForkSafeThread(self.run, "model-loader", restart=False)
+    
+    def start(self):
+        self._thread.ensure_started()
+    
+    def run(self, warmup=True):
+        try:
+            if model is None or tokenizer is None:
+                self.status = "loading"
+                load_translations_dict()
+                load_model()
+            self.status = "warming"
+            if warmup:
+                self.warmup()
+                self.status = "ready"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+    
+    def warmup(self):
+        with startup_stage("warmup"):
+            for source, target in (("en", "mr"), ("mr", "en")):
+                # Directions that are not loaded yet warm up with their first request
+                if model_registry.is_loaded(direction_for(source, target)):
+                    translate_batch_with_indictrans2(WARMUP_TEXTS[source], source, target)
+        print(f"✓ Model warmed up in {startup_timings['warmup']:.2f}s")
+
+model_loader = ModelLoader()
+
+# IndicTrans2 expects the text preparation its training data had (as done by
+# IndicTransToolkit's IndicProcessor): Moses punctuation normalization, Moses
+# tokenization for English, Indic normalization and tokenization (in
+# Devanagari) for Indic languages, and emails, URLs, numbers and format
+# placeholders swapped for <ID> tags the model copies through. Results are
+# cached per string, so repeated UI strings cost one dictionary lookup.
+PLACEHOLDER_RE = re.compile("|".join([
+    r"[\w.+-]+@[\w-]+\.[\w.-]*\w",
+    r"(?:https?://|www\.)\S*[^\s.,!?;:)\]'\"]",
+    r"~?\d+\.?\d*\s?%?\s?-?\s?~?\d+\.?\d*\s?%|~?\d+%|\d+[\-/.,:']\d+[\-/.,:'+]\d+(?:\.\d+)?|\d+[\-/.:'+]\d+(?:\.\d+)?",
+    r"\{[^{}\s]*\}"
+]))
+ID_TAG_RE = re.compile(r"<\s*ID\s*(\d+)\s*>|\[\s*ID\s*(\d+)\s*\]")
+DEVANAGARI_LANGS = {"mr", "hi", "ne", "sa", "kok", "mai", "doi", "brx"}
+
+@lru_cache(maxsize=None)
+def _language_tools(lang):
+    """sacremoses and indic-nlp-library objects for a language, created on first use"""
+    from sacremoses import MosesDetokenizer, MosesPunctNormalizer, MosesTokenizer
+    
+    tools = {"punct": MosesPunctNormalizer(lang=lang)}
+    if lang == "en":
+        tools["tokenizer"] = MosesTokenizer(lang="en")
+        tools["detokenizer"] = MosesDetokenizer(lang="en")
+    else:
+        from indicnlp.normalize.indic_normalize import IndicNormalizerFactory
+        tools["normalizer"] = IndicNormalizerFactory().get_normalizer(lang)
+    return tools
+
+@lru_cache(maxsize=PROCESSING_CACHE_SIZE)
+def _preprocess(text, lang):
+    """Model-ready form of one source string, returns (text, placeholder originals)"""
+    originals = []
+    
+    def wrap(match):
+        originals.append(match.group(0))
+        return f"<ID{len(originals)}>"
+    
+    text = PLACEHOLDER_RE.sub(wrap, text.strip())
+    tools = _language_tools(lang)
+    text = tools["punct"].normalize(text)
+    
+    if lang == "en":
+        return " ".join(tools["tokenizer"].tokenize(text, escape=False, protected_patterns=[r"<ID\d+>"])), tuple(originals)
+    
+    from indicnlp.tokenize import indic_tokenize
+    from indicnlp.transliterate.unicode_transliterate import UnicodeIndicTransliterator
+    
+    text = " ".join(indic_tokenize.trivial_tokenize(tools["normalizer"].normalize(text), lang))
+    if lang not in DEVANAGARI_LANGS:
+        # The model reads every Indic language in Devanagari
+        text = UnicodeIndicTransliterator.transliterate(text, lang, "hi").replace(" ् ", "्")
+    return ID_TAG_RE.sub(lambda m: f"<ID{m.group(1) or m.group(2)}>", text), tuple(originals)
+
+@lru_cache(maxsize=PROCESSING_CACHE_SIZE)
+def _postprocess(text, lang, originals):
+    """Detokenize one model output and put placeholder originals back"""
+    if lang == "en":
+        text = _language_tools(lang)["detokenizer"].detokenize(text.split())
+    else:
+        from indicnlp.tokenize import indic_detokenize
+        from indicnlp.transliterate.unicode_transliterate import UnicodeIndicTransliterator
+        
+        if lang not in DEVANAGARI_LANGS:
+            text = UnicodeIndicTransliterator.transliterate(text, "hi", lang)
+        text = indic_detokenize.trivial_detokenize(text, lang)
+    
+    if originals:
+        def restore(match):
+            i = int(match.group(1) or match.group(2)) - 1
+            return originals[i] if 0 <= i < len(originals) else ""
+        text = ID_TAG_RE.sub(restore, text)
+    return text
+
+def preprocess_batch(texts, source_lang):
+    """
+    Prepare a batch of source strings for the model
+    Returns (model inputs, placeholder originals per input)
+    """
+    if not INDICTRANS_PROCESSING:
+        return list(texts), [()] * len(texts)
+    with PREPROCESS_SECONDS.time():
+        processed = [_preprocess(text, source_lang) for text in texts]
+    return [text for text, _ in processed], [originals for _, originals in processed]
+
+def postprocess_batch(translations, target_lang, originals):
+    """Turn a batch of model outputs back into plain text"""
+    if not INDICTRANS_PROCESSING:
+        return translations
+    with POSTPROCESS_SECONDS.time():
+        return [_postprocess(text, target_lang, o) for text, o in zip(translations, originals)]
+
+def processing_stats():
+    stats = {"enabled": INDICTRANS_PROCESSING}
+    for name, function in (("preprocess", _preprocess), ("postprocess", _postprocess)):
+        info = function.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0
+        }
+    return stats
+
+def encode_for_indictrans2(texts, source_lang, target_lang):
+    """
+    Tokenize texts for IndicTrans2 without padding
+    IndicTrans2 requires input format: "<src_lang> <tgt_lang> <text>"
+    Returns a list of input id lists
+    """
+    engine = model_registry.get(direction_for(source_lang, target_lang)).backend
+    
+    # Convert language codes
+    src_code = LANG_CODE_MAP.get(source_lang, source_lang)
+    tgt_code = LANG_CODE_MAP.get(target_lang, target_lang)
+    
+    # IndicTrans2 expects format: "<src_lang> <tgt_lang> <text>"
+    input_texts = [f"{src_code} {tgt_code} {text}" for text in texts]
+    
+    with TOKENIZE_SECONDS.time():
+        return engine.tokenize(input_texts)
+
+def check_truncation(input_ids):
+    """Count and report model inputs the tokenizer cut off at MAX_INPUT_TOKENS"""
+    truncated = sum(1 for ids in input_ids if len(ids) >= MAX_INPUT_TOKENS)
+    if truncated:
+        TRUNCATED_TOTAL.inc(truncated)
+        print(f"⚠ {truncated} input(s) truncated to {MAX_INPUT_TOKENS} tokens")
+
+def record_batch(engine, input_ids, output_ids):
+    """Count one generate call: batch size and input/output tokens"""
+    MODEL_CALLS_TOTAL.inc()
+    BATCH_SIZE.observe(len(input_ids))
+    TOKENS_TOTAL.labels("input").inc(sum(len(ids) for ids in input_ids))
+    if hasattr(output_ids, "sum"):
+        # Padded tensor from the torch backend
+        TOKENS_TOTAL.labels("output").inc(int((output_ids != engine.tokenizer.pad_token_id).sum()))
+    else:
+        TOKENS_TOTAL.labels("output").inc(sum(len(ids) for ids in output_ids))
+
+_tag_overheads = {}
+
+def tag_overhead(source_lang, target_lang):
+    """Tokens added around every input: language tags and end of sentence"""
+    key = (source_lang, target_lang)
+    if key not in _tag_overheads:
+        _tag_overheads[key] = len(encode_for_indictrans2([""], source_lang, target_lang)[0])
+    return _tag_overheads[key]
+
+def output_max_length(source_tokens):
+    """Output cap proportional to the source length"""
+    return min(MAX_INPUT_TOKENS, int(source_tokens * OUTPUT_LENGTH_RATIO) + OUTPUT_LENGTH_SLACK)
+
+def beams_for_quality(quality, source_tokens):
+    """Beam count for a quality tier; "auto" keeps short UI strings cheap"""
+    if quality == "auto":
+        return min(2, DEFAULT_NUM_BEAMS) if source_tokens <= SHORT_INPUT_TOKENS else DEFAULT_NUM_BEAMS
+    return QUALITY_BEAMS[quality]
+
+# Sentence boundaries: terminal punctuation (plus danda for Marathi), optional
+# closing quotes/brackets, then whitespace. Group 1 is the separator to keep.
+SENTENCE_BOUNDARY_RE = {
+    "en": re.compile(r'[.!?\u2026]+["\'\u201d\u2019)\]]*(\s+)'),
+    "mr": re.compile(r'[.!?\u2026\u0964\u0965]+["\'\u201d\u2019)\]]*(\s+)')
+}
+PARAGRAPH_BREAK_RE = re.compile(r'\s*\n\s*')
+WORD_RE = re.compile(r'\S+\s*')
+
+def split_sentences(paragraph, lang):
+    """Split a paragraph into sentences, each keeping its trailing whitespace"""
+    boundary_re = SENTENCE_BOUNDARY_RE.get(lang, SENTENCE_BOUNDARY_RE["en"])
+    sentences = []
+    start = 0
+    for m in boundary_re.finditer(paragraph):
+        sentences.append(paragraph[start:m.end(1)])
+        start = m.end(1)
+    if start < len(paragraph):
+        sentences.append(paragraph[start:])
+    return sentences
+
+def _pack(pieces, lengths, limit):
+    """Greedily join consecutive pieces while their token count stays under limit"""
+    chunks = []
+    chunk = ""
+    chunk_len = 0
+    for piece, length in zip(pieces, lengths):
+        if chunk and chunk_len + length > limit:
+            chunks.append(chunk)
+            chunk = ""
+            chunk_len = 0
+        chunk += piece
+        chunk_len += length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def _count_tokens(pieces, source_lang, target_lang):
+    """
+    Token count of each piece as the model sees it (after preprocessing, which
+    adds tokenization and <ID> placeholders), excluding language tags and end
+    of sentence
+    """
+    overhead = tag_overhead(source_lang, target_lang)
+    model_inputs, _ = preprocess_batch(pieces, source_lang)
+    return [max(1, len(ids) - overhead) for ids in encode_for_indictrans2(model_inputs, source_lang, target_lang)]
+
+def chunk_paragraph(paragraph, source_lang, target_lang, limit):
+    """Split a paragraph into chunks of whole sentences under limit tokens"""
+    sentences = split_sentences(paragraph, source_lang)
+    lengths = _count_tokens(sentences, source_lang, target_lang)
+    
+    pieces = []
+    piece_lengths = []
+    for sentence, length in zip(sentences, lengths):
+        if length <= limit:
+            pieces.append(sentence)
+            piece_lengths.append(length)
+            continue
+        
+        # A single sentence over the limit is split between words
+        words = WORD_RE.findall(sentence)
+        word_lengths = _count_tokens(words, source_lang, target_lang)
+        for part in _pack(words, word_lengths, limit):
+            pieces.append(part)
+            piece_lengths.append(limit)
+    
+    return [chunk.strip() for chunk in _pack(pieces, piece_lengths, limit)]
+
+def segment_text(text, source_lang, target_lang):
+    """
+    Split text into chunks that fit the model's input limit
+    Paragraph breaks always separate chunks; paragraphs longer than the limit
+    are split into sentences and packed. Returns (chunks, separators) where
+    separators[i] is the original whitespace between chunks[i] and chunks[i+1].
+    """
+    limit = MAX_INPUT_TOKENS - SEGMENT_TOKEN_MARGIN
+    chunks = []
+    separators = []
+    
+    start = 0
+    paragraphs = []
+    text = text.strip()
+    for m in PARAGRAPH_BREAK_RE.finditer(text):
+        paragraphs.append((text[start:m.start()], m.group()))
+        start = m.end()
+    paragraphs.append((text[start:], ""))
+    
+    # Preprocessing can make short text long in tokens (numbers, punctuation,
+    # placeholders), so every paragraph is measured. _preprocess caches what
+    # it does here for the chunk's own preprocessing later.
+    lengths = _count_tokens([paragraph for paragraph, _ in paragraphs], source_lang, target_lang)
+    for (paragraph, paragraph_break), length in zip(paragraphs, lengths):
+        if length <= limit:
+            paragraph_chunks = [paragraph]
+        else:
+            paragraph_chunks = chunk_paragraph(paragraph, source_lang, target_lang, limit)
+        
+        for i, chunk in enumerate(paragraph_chunks):
+            chunks.append(chunk)
+            separators.append(paragraph_break if i == len(paragraph_chunks) - 1 else " ")
+    
+    return chunks, separators[:-1]
+
+def reassemble(translations, separators):
+    """Join translated chunks with the original whitespace between them"""
+    parts = [translations[0]]
+    for separator, translation in zip(separators, translations[1:]):
+        parts.append(separator)
+        parts.append(translation)
+    return "".join(parts)
+
+def translate_batch_with_indictrans2(texts, source_lang, target_lang, quality=DEFAULT_QUALITY):
+    """
+    Translate a list of texts through the scheduler at bulk priority, for
+    offline and startup work; results are returned in input order
+    The scheduler splits long texts, batches by length and never downgrades
+    bulk work, so this runs the same path as the server.
+    """
+    futures = scheduler.submit_many(texts, source_lang, target_lang, quality, priority=PRIORITY_BULK)
+    return [future.result() for future in futures]
+
+class DeadlineExceeded(Exception):
+    """The request's deadline passed before its translations were done"""
+
+class Deadline:
+    """
+    How long queued work stays useful: until the latest deadline of the
+    requests waiting for it, or until every one of them has gone away.
+    Shared by requests coalesced onto the same translation.
+    """
+    __slots__ = ("at", "waiters", "_lock")
+    
+    def __init__(self, at=None):
+        self.at = at  # time.monotonic() value, None for no deadline
+        self.waiters = 1
+        self._lock = threading.Lock()
+    
+    def join(self, at):
+        with self._lock:
+            self.waiters += 1
+            if self.at is not None:
+                self.at = None if at is None else max(self.at, at)
+    
+    def leave(self):
+        with self._lock:
+            self.waiters -= 1
+    
+    def expired(self, now=None):
+        if self.waiters <= 0:
+            return True
+        return self.at is not None and (now or time.monotonic()) > self.at
+
+def request_deadline(timeout_ms):
+    """time.monotonic() deadline for a request timeout, None without one"""
+    return time.monotonic() + timeout_ms / 1000.0 if timeout_ms else None
+
+class _BatchItem:
+    """
+    A tokenized sentence waiting in the scheduler queue
+    Items batch together when their key (language pair, beams) matches
+    """
+    __slots__ = ("key", "input_ids", "max_length", "placeholders", "future", "enqueued_at", "deadline")
+    
+    def __init__(self, key, input_ids, max_length, placeholders=(), deadline=None):
+        self.key = key
+        self.input_ids = input_ids
+        self.max_length = max_length
+        self.placeholders = placeholders
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+    
+    def expired(self, now=None):
+        return self.deadline is not None and self.deadline.expired(now)
+
+def _join_chunks(chunk_futures, separators):
+    """Future that resolves to the reassembled text once every chunk is done"""
+    joined = Future()
+    joined.full_quality = all(future.full_quality for future in chunk_futures)
+    remaining = [len(chunk_futures)]
+    lock = threading.Lock()
+    
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            joined.set_result(reassemble([f.result() for f in chunk_futures], separators))
+        except Exception as e:
+            joined.set_exception(e)
+    
+    for future in chunk_futures:
+        future.add_done_callback(on_done)
+    return joined
+
+# Scheduler priorities: bulk work only fills batch slots interactive traffic leaves free
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+class Overloaded(Exception):
+    """Work rejected by admission control; retry_after is in whole seconds"""
+    
+    def __init__(self, message, reason, retry_after=1):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = max(1, int(retry_after))
+
+class BatchScheduler:
+    """
+    Cross-request dynamic micro-batching in front of the model.
+    
+    Sentences submitted by concurrent requests are collected into a shared
+    queue and flushed as one padded batch once either max_batch_size items
+    are waiting or the oldest item has waited max_wait_ms. Items from one
+    request are queued sorted by token length, so consecutive flushes form
+    length buckets. Interactive items always go first; bulk items (background
+    jobs) are only batched when no interactive item is waiting or to fill
+    up an interactive batch.
+    """
+    
+    def __init__(self, max_batch_size=16, max_wait_ms=10, max_batch_tokens=8192):
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_batch_tokens = max(1, int(max_batch_tokens))
+        self._queues = {PRIORITY_INTERACTIVE: deque(), PRIORITY_BULK: deque()}
+        self._cond = threading.Condition()
+        self._thread = ForkSafeThread(self._run, "batch-scheduler")
+        
+        # Stats
+        self._batches = 0
+        self._items = 0
+        self._last_batch_size = 0
+        self._max_batch_size_seen = 0
+        self._downgraded = 0
+        self._rejected = 0
+        self._expired = 0
+        self._wasted_seconds = 0.0
+        self._step_ms = {}  # beams -> moving average of ms per decoding step
+        self._batch_ms = None  # moving average of ms per batch
+        self._busy = False
+    
+    def submit(self, text, source_lang, target_lang, quality=DEFAULT_QUALITY, latency_budget_ms=None,
+               priority=PRIORITY_INTERACTIVE):
+        """Queue a sentence for translation, returns a Future"""
+        return self.submit_many([text], source_lang, target_lang, quality, latency_budget_ms, priority)[0]
+    
+    def queue_depth(self, priority=PRIORITY_INTERACTIVE):
+        return len(self._queues[priority])
+    
+    def oldest_wait(self):
+        """Seconds the oldest queued item has been waiting, 0 when idle"""
+        with self._cond:
+            oldest = [queue[0].enqueued_at for queue in self._queues.values() if queue]
+        return time.monotonic() - min(oldest) if oldest else 0.0
+    
+    def _pending_count(self):
+        return sum(len(queue) for queue in self._queues.values())
+    
+    def estimated_wait_ms(self):
+        """Time until newly queued interactive work reaches the model: the batches ahead of it"""
+        with self._cond:
+            depth = self.queue_depth()
+            if self._batch_ms is None or not (depth or self._busy):
+                return 0.0
+            return (-(-depth // self.max_batch_size) + self._busy) * self._batch_ms
+    
+    def admit(self, count, priority=PRIORITY_INTERACTIVE):
+        """
+        Raise Overloaded unless count more interactive items fit the queue
+        and the wait ahead of them fits QUEUE_MAX_WAIT_MS. Bulk work is never
+        rejected, it waits. An idle queue always admits, however large the
+        request.
+        """
+        if priority != PRIORITY_INTERACTIVE:
+            return
+        depth = self.queue_depth()
+        if not depth:
+            return
+        
+        wait_ms = self.estimated_wait_ms()
+        if QUEUE_MAX_DEPTH > 0 and depth + count > QUEUE_MAX_DEPTH:
+            self._rejected += 1
+            raise Overloaded(f"Translation queue is full ({depth} sentences waiting)", "queue_full", -(-wait_ms // 1000))
+        if QUEUE_MAX_WAIT_MS > 0 and wait_ms > QUEUE_MAX_WAIT_MS:
+            self._rejected += 1
+            raise Overloaded(f"Estimated wait of {wait_ms / 1000:.1f}s exceeds the limit", "wait", -(-wait_ms // 1000))
+    
+    def under_load(self):
+        """True while beams are being downgraded because the queue is backed up"""
+        return LOAD_DOWNGRADE_DEPTH > 0 and self.queue_depth() >= LOAD_DOWNGRADE_DEPTH
+    
+    def choose_beams(self, quality, source_tokens, latency_budget_ms=None, priority=PRIORITY_INTERACTIVE):
+        """
+        Beams for one sentence: the quality tier, halved per LOAD_DOWNGRADE_DEPTH
+        interactive items waiting, then reduced until the estimated decode time
+        fits the latency budget. Bulk work waits instead of being downgraded.
+        """
+        beams = beams_for_quality(quality, source_tokens)
+        if LOAD_DOWNGRADE_DEPTH > 0 and priority == PRIORITY_INTERACTIVE:
+            beams = max(1, beams >> (self.queue_depth() // LOAD_DOWNGRADE_DEPTH))
+        
+        if latency_budget_ms is not None:
+            # Translations run roughly as long as their source
+            steps = source_tokens + 2
+            while beams > 1 and self._step_ms.get(beams, 0.0) * steps > latency_budget_ms:
+                beams //= 2
+        return beams
+    
+    def submit_many(self, texts, source_lang, target_lang, quality=DEFAULT_QUALITY, latency_budget_ms=None,
+                    priority=PRIORITY_INTERACTIVE, deadlines=None):
+        """
+        Queue several texts, returns one Future per text in input order
+        Long texts are split into chunks that are queued individually and
+        reassembled when all of them are done. Decoding parameters are chosen
+        per chunk from its length, the quality tier and the latency budget;
+        each future's full_quality tells whether every chunk got the tier's
+        beams, i.e. whether the result may be cached.
+        deadlines holds an optional Deadline per text; chunks whose deadline
+        has expired are dropped and their futures fail with DeadlineExceeded.
+        """
+        segmented = [segment_text(text, source_lang, target_lang) for text in texts]
+        chunks = [chunk for text_chunks, _ in segmented for chunk in text_chunks]
+        chunk_deadlines = [
+            deadline
+            for (text_chunks, _), deadline in zip(segmented, deadlines or [None] * len(texts))
+            for _ in text_chunks
+        ]
+        
+        # Chunks of split texts that the glossary fully covers (e.g. one menu
+        # label per line) are answered without the model. Whole texts have
+        # already been looked up by the caller.
+        chunk_futures = [None] * len(chunks)
+        model_chunks = []
+        i = 0
+        for text_chunks, _ in segmented:
+            for chunk in text_chunks:
+                translated = lookup_dict(chunk, source_lang, target_lang) if len(text_chunks) > 1 else None
+                if translated is None:
+                    model_chunks.append(i)
+                else:
+                    chunk_futures[i] = Future()
+                    chunk_futures[i].full_quality = True
+                    chunk_futures[i].set_result(translated)
+                i += 1
+        
+        model_inputs, placeholders = preprocess_batch([chunks[i] for i in model_chunks], source_lang)
+        input_ids = encode_for_indictrans2(model_inputs, source_lang, target_lang) if model_chunks else []
+        check_truncation(input_ids)
+        overhead = tag_overhead(source_lang, target_lang) if input_ids else 0
+        items = []
+        for i, ids, originals in zip(model_chunks, input_ids, placeholders):
+            source_tokens = len(ids) - overhead
+            beams = self.choose_beams(quality, source_tokens, latency_budget_ms, priority)
+            full_quality = beams == beams_for_quality(quality, source_tokens)
+            if not full_quality:
+                self._downgraded += 1
+            item = _BatchItem(
+                (source_lang, target_lang, beams), ids, output_max_length(source_tokens), originals, chunk_deadlines[i]
+            )
+            item.future.full_quality = full_quality
+            items.append(item)
+        for i, item in zip(model_chunks, items):
+            chunk_futures[i] = item.future
+        
+        with self._cond:
+            self._thread.ensure_started()
+            self._queues[priority].extend(sorted(items, key=lambda item: len(item.input_ids)))
+            self._cond.notify()
+        
+        futures = []
+        offset = 0
+        for text_chunks, separators in segmented:
+            text_futures = chunk_futures[offset:offset + len(text_chunks)]
+            offset += len(text_chunks)
+            if len(text_futures) == 1:
+                futures.append(text_futures[0])
+            else:
+                futures.append(_join_chunks(text_futures, separators))
+        return futures
+    
+    def stats(self):
+        with self._cond:
+            return {
+                "queue_depth": self.queue_depth(),
+                "bulk_queue_depth": self.queue_depth(PRIORITY_BULK),
+                "max_batch_size": self.max_batch_size,
+                "max_batch_tokens": self.max_batch_tokens,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": self._batches,
+                "items": self._items,
+                "last_batch_size": self._last_batch_size,
+                "largest_batch_size": self._max_batch_size_seen,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "downgraded_items": self._downgraded,
+                "rejected_requests": self._rejected,
+                "expired_items": self._expired,
+                "wasted_generate_seconds": round(self._wasted_seconds, 3),
+                "estimated_wait_ms": round(self.estimated_wait_ms(), 1),
+                "ms_per_step_by_beams": {beams: round(ms, 3) for beams, ms in self._step_ms.items()}
+            }
+    
+    def _fill(self, queue, key, batch, longest):
+        """
+        Move items with key from queue into batch, in queue order, up to
+        max_batch_size items and max_batch_tokens padded tokens
+        Returns (remaining queue, longest input, batch is full)
+        """
+        full = len(batch) >= self.max_batch_size
+        remaining = deque()
+        while queue:
+            item = queue.popleft()
+            if item.key != key or full:
+                remaining.append(item)
+                continue
+            length = max(longest, len(item.input_ids))
+            if batch and (len(batch) + 1) * length > self.max_batch_tokens:
+                full = True
+                remaining.append(item)
+                continue
+            batch.append(item)
+            longest = length
+            full = len(batch) >= self.max_batch_size
+        return remaining, longest, full
+    
+    def _take_batch(self):
+        """
+        Pop the next batch: items sharing the language pair and beams of the
+        oldest interactive item (or oldest bulk item when none is waiting),
+        topped up with matching bulk items
+        """
+        interactive = self._queues[PRIORITY_INTERACTIVE]
+        bulk = self._queues[PRIORITY_BULK]
+        key = (interactive or bulk)[0].key
+        batch = []
+        
+        remaining, longest, full = self._fill(interactive, key, batch, 0)
+        self._queues[PRIORITY_INTERACTIVE] = remaining
+        if not full:
+            self._queues[PRIORITY_BULK], _, _ = self._fill(bulk, key, batch, longest)
+        return batch
+    
+    def _drop_expired(self):
+        """Fail and remove queued items whose deadline passed or whose requests went away"""
+        now = time.monotonic()
+        for priority, queue in self._queues.items():
+            if not any(item.expired(now) for item in queue):
+                continue
+            kept = deque()
+            for item in queue:
+                if item.expired(now):
+                    self._expire([item], "queued")
+                else:
+                    kept.append(item)
+            self._queues[priority] = kept
     
-    if translations_dict is not None:
-        return translations_dict
+    def _expire(self, items, stage):
+        self._expired += len(items)
+        EXPIRED_TOTAL.labels(stage).inc(len(items))
+        for item in items:
+            if not item.future.done():
+                item.future.set_exception(DeadlineExceeded("Deadline exceeded"))
     
-    dict_path = Path("translations_dict.json")
-    if dict_path.exists():
-        with open(dict_path, 'r', encoding='utf-8') as f:
-            translations_dict = json.load(f)
-        print("✓ Translations dictionary loaded")
-    else:
-        translations_dict = {"en_to_mr": {}, "mr_to_en": {}}
-        print("⚠ Translations dictionary not found, using model only")
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending_count():
+                    self._cond.wait()
+                
+                # Wait for the batch to fill up or the oldest item to time out
+                oldest = (self._queues[PRIORITY_INTERACTIVE] or self._queues[PRIORITY_BULK])[0]
+                flush_at = oldest.enqueued_at + self.max_wait
+                while self._pending_count() < self.max_batch_size:
+                    remaining = flush_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                
+                self._drop_expired()
+                if not self._pending_count():
+                    continue
+                batch = self._take_batch()
+                self._busy = True
+                self._batches += 1
+                self._items += len(batch)
+                self._last_batch_size = len(batch)
+                self._max_batch_size_seen = max(self._max_batch_size_seen, len(batch))
+            
+            try:
+                self._run_batch(batch)
+            finally:
+                self._busy = False
     
-    return translations_dict
+    def _run_batch(self, batch):
+        global last_inference_at
+        
+        source_lang, target_lang, num_beams = batch[0].key
+        max_length = max(item.max_length for item in batch)
+        stopped = []
+        
+        def should_stop():
+            # Polled every decoding step: give up once nobody waits for any item
+            now = time.monotonic()
+            if all(item.expired(now) for item in batch):
+                stopped.append(True)
+                return True
+            return False
+        
+        try:
+            engine = model_registry.get(direction_for(source_lang, target_lang)).backend
+            with model_lock:
+                started = time.monotonic()
+                output_ids = engine.generate(
+                    [item.input_ids for item in batch],
+                    num_beams=num_beams,
+                    max_length=max_length,
+                    should_stop=should_stop
+                )
+                elapsed_ms = (time.monotonic() - started) * 1000.0
+            GENERATE_SECONDS.observe(elapsed_ms / 1000.0)
+            
+            # Time spent on items that expired during generate was wasted
+            now = time.monotonic()
+            dead = [item for item in batch if item.expired(now)]
+            if dead:
+                wasted = elapsed_ms / 1000.0 * len(dead) / len(batch)
+                self._wasted_seconds += wasted
+                WASTED_SECONDS.inc(wasted)
+            last_inference_at = time.time()
+            record_batch(engine, [item.input_ids for item in batch], output_ids)
+            if stopped:
+                # Cut short: the outputs are partial
+                self._expire(batch, "generate")
+                return
+            with DECODE_SECONDS.time():
+                translations = engine.detokenize(output_ids)
+            translations = postprocess_batch(translations, target_lang, [item.placeholders for item in batch])
+        except Exception as e:
+            for item in batch:
+                item.future.set_exception(e)
+            return
+        
+        steps = max(1, max(len(ids) for ids in output_ids))
+        previous = self._step_ms.get(num_beams)
+        step_ms = elapsed_ms / steps
+        self._step_ms[num_beams] = step_ms if previous is None else 0.8 * previous + 0.2 * step_ms
+        self._batch_ms = elapsed_ms if self._batch_ms is None else 0.8 * self._batch_ms + 0.2 * elapsed_ms
+        
+        for item, translation in zip(batch, translations):
+            item.future.set_result(translation)
 
-def load_model():
-    """Load the IndicTrans2 translation model"""
-    global model, tokenizer
+scheduler = BatchScheduler(BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_MAX_TOKENS)
+
+def translate_with_indictrans2(text, source_lang, target_lang, quality=DEFAULT_QUALITY, latency_budget_ms=None):
+    """
+    Translate using IndicTrans2 model
+    The sentence is batched with concurrent requests by the scheduler
+    """
+    return scheduler.submit(text, source_lang, target_lang, quality, latency_budget_ms).result()
+
+class TranslationCache:
+    """
+    Memory-bounded LRU cache of model translations.
     
-    if model is not None and tokenizer is not None:
-        return model, tokenizer
+    Bounded by entry count and an approximate byte budget, with optional
+    TTL. Keys are built with cache_key().
+    """
     
-    print("Loading IndicTrans2 model...")
-    print(f"Device: {device}")
+    # Rough per-entry overhead of the OrderedDict slot, key tuple and timestamps
+    ENTRY_OVERHEAD = 200
     
-    if not MODEL_DIR.exists():
-        raise FileNotFoundError(f"Model not found at {MODEL_DIR}. Run: python scripts/download_indictrans2.py")
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, ttl_seconds=0):
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl = max(0.0, float(ttl_seconds))
+        self._entries = OrderedDict()  # key -> (translation, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
     
-    try:
-        tokenizer = AutoTokenizer.from_pretrained(
-            str(MODEL_DIR),
-            local_files_only=True,
-            trust_remote_code=True
-        )
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+    
+    def get(self, key):
+        """Return the cached translation or None"""
+        if not self.enabled:
+            return None
         
-        model = AutoModelForSeq2SeqLM.from_pretrained(
-            str(MODEL_DIR),
-            local_files_only=True,
-            trust_remote_code=True
-        ).to(device)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            translation, size, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return translation
+    
+    def put(self, key, translation):
+        if not self.enabled:
+            return
         
-        model.eval()  # Set to evaluation mode
+        size = self.ENTRY_OVERHEAD + sys.getsizeof(key[2]) + sys.getsizeof(translation)
+        if size > self.max_bytes:
+            return
         
-        print("✓ IndicTrans2 model loaded successfully")
-        return model, tokenizer
-    except Exception as e:
-        print(f"✗ Failed to load model: {e}")
-        raise
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (translation, size, time.monotonic())
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            cleared = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        return cleared
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+    
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+translation_cache = TranslationCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_TTL_SECONDS)
 
-def translate_with_indictrans2(text, source_lang, target_lang):
+class PersistentTranslationCache:
     """
-    Translate using IndicTrans2 model
-    IndicTrans2 requires input format: "<src_lang> <tgt_lang> <text>"
+    SQLite (WAL mode) translation cache shared by all worker processes.
+    
+    Lookups read the database directly; writes are buffered and flushed in
+    bulk with executemany from a background thread, off the request path.
+    The oldest entries are evicted once the stored text exceeds max_bytes.
+    Rows are tagged with version(source, target), so entries written by a
+    different model, variant or processing mode are never returned.
     """
-    if model is None or tokenizer is None:
-        load_model()
     
-    # Convert language codes
-    src_code = LANG_CODE_MAP.get(source_lang, source_lang)
-    tgt_code = LANG_CODE_MAP.get(target_lang, target_lang)
+    FLUSH_BATCH = 500
     
-    # IndicTrans2 expects format: "<src_lang> <tgt_lang> <text>"
-    input_text = f"{src_code} {tgt_code} {text}"
-    
-    # Tokenize
-    inputs = tokenizer(
-        input_text,
-        return_tensors="pt",
-        padding=True,
-        truncation=True,
-        max_length=256
-    ).to(device)
-    
-    # Generate translation
-    with torch.no_grad():
-        generated_tokens = model.generate(
-            **inputs,
-            max_length=256,
-            num_beams=4,
-            num_return_sequences=1,
-            early_stopping=True
-        )
+    def __init__(self, cache_dir, max_bytes=512 * 1024 * 1024, ttl_seconds=0, flush_seconds=1.0, version=None):
+        self.path = Path(cache_dir) / "translations.db" if cache_dir else None
+        self.version = version
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl = max(0.0, float(ttl_seconds))
+        self.flush_seconds = max(0.05, float(flush_seconds))
+        self._connections = ThreadConnections(self._connect)
+        self._pending = []
+        self._cond = threading.Condition()
+        self._writer = ForkSafeThread(self._run, "cache-writer")
+        
+        # Stats (per process)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+        
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS translations (
+                        source TEXT NOT NULL,
+                        target TEXT NOT NULL,
+                        params TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        translation TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created REAL NOT NULL,
+                        PRIMARY KEY (source, target, params, text)
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS translations_created ON translations (created)")
+    
+    @property
+    def enabled(self):
+        return self.path is not None
+    
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def _conn(self):
+        return self._connections.get()
+    
+    def _row_key(self, key):
+        source, target, text, params = key
+        if self.version is not None:
+            # Older rows without the tag are left to TTL and size eviction
+            params = f"{self.version(source, target)}/{params}"
+        return (source, target, str(params), text)
+    
+    def get(self, key):
+        """Return the stored translation or None"""
+        if not self.enabled:
+            return None
+        
+        try:
+            row = self._conn().execute(
+                "SELECT translation, created FROM translations "
+                "WHERE source = ? AND target = ? AND params = ? AND text = ?",
+                self._row_key(key)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"⚠ Persistent cache read failed: {e}")
+            return None
+        
+        if row is None or (self.ttl and time.time() - row[1] > self.ttl):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return row[0]
+    
+    def put(self, key, translation):
+        """Queue a translation for the next bulk write"""
+        if not self.enabled:
+            return
+        
+        size = len(key[2].encode("utf-8")) + len(translation.encode("utf-8"))
+        with self._cond:
+            if self._writer.ensure_started():
+                # Writes queued before a fork belong to the parent
+                self._pending = []
+            self._pending.append(self._row_key(key) + (translation, size, time.time()))
+            if len(self._pending) >= self.FLUSH_BATCH:
+                self._cond.notify()
+    
+    def clear(self):
+        if not self.enabled:
+            return 0
+        
+        with self._cond:
+            self._pending = []
+        return self._conn().execute("DELETE FROM translations").rowcount
+    
+    def stats(self):
+        if not self.enabled:
+            return {"enabled": False}
+        
+        try:
+            entries, stored_bytes = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, stored_bytes = None, None
+        
+        with self._cond:
+            pending = len(self._pending)
+        
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": stored_bytes,
+            "max_bytes": self.max_bytes,
+            "pending_writes": pending,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors
+        }
     
-    # Decode
-    translation = tokenizer.batch_decode(
-        generated_tokens,
-        skip_special_tokens=True
-    )[0]
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._pending) < self.FLUSH_BATCH:
+                    self._cond.wait(self.flush_seconds)
+                rows, self._pending = self._pending, []
+            
+            if rows:
+                self.flush(rows)
     
-    # Clean up output
-    translation = translation.strip()
+    def flush(self, rows):
+        """Write rows in one transaction and evict if over budget"""
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(source, target, params, text, translation, size, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+            self.writes += len(rows)
+            self._evict(conn)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"⚠ Persistent cache write failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
     
-    return translation
+    def _evict(self, conn):
+        """Drop the oldest entries until the store is back under 90% of max_bytes"""
+        if not self.max_bytes:
+            return
+        
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        excess = total - int(self.max_bytes * 0.9)
+        cursor = conn.execute("""
+            DELETE FROM translations WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, size, SUM(size) OVER (ORDER BY created, rowid) AS running
+                    FROM translations
+                ) WHERE running - size < ?
+            )
+        """, (excess,))
+        self.evictions += cursor.rowcount
+
+persistent_cache = PersistentTranslationCache(
+    CACHE_DIR, PERSISTENT_CACHE_MAX_BYTES, CACHE_TTL_SECONDS, PERSISTENT_CACHE_FLUSH_SECONDS,
+    version=lambda source, target: model_version(direction_for(source, target))
+)
+
+def cache_get(key):
+    """Look up a translation in memory, then in the persistent cache"""
+    translated = translation_cache.get(key)
+    if translated is None:
+        translated = persistent_cache.get(key)
+        if translated is not None:
+            translation_cache.put(key, translated)
+    CACHE_LOOKUPS_TOTAL.labels("miss" if translated is None else "hit").inc()
+    return translated
 
-def translate_with_dict(text, source, target):
+def cache_put(key, translation):
+    translation_cache.put(key, translation)
+    persistent_cache.put(key, translation)
+
+def cache_key(text, source, target, quality=DEFAULT_QUALITY):
+    """Cache key: (source, target, normalized text, decoding params)"""
+    normalized = unicodedata.normalize("NFC", text.strip())
+    return (source, target, normalized, quality)
+
+def lookup_dict(text, source, target):
+    """Return the dictionary translation for text, or None"""
+    with DICTIONARY_SECONDS.time():
+        return load_glossary().lookup(text, source, target)
+
+def translate_with_dict(text, source, target, quality=DEFAULT_QUALITY, latency_budget_ms=None):
     """
     Translate using dictionary first, fallback to IndicTrans2
     Returns (translation, used_dict)
     """
-    dict_data = load_translations_dict()
+    # Check dictionary first
+    translated = lookup_dict(text, source, target)
+    if translated is not None:
+        TEXTS_TOTAL.labels("dictionary").inc()
+        return translated, True
     
-    # Normalize text for dictionary lookup
-    text_lower = text.lower().strip()
+    # Then previously translated text
+    key = cache_key(text, source, target, quality)
+    translated = cache_get(key)
+    if translated is not None:
+        TEXTS_TOTAL.labels("cache").inc()
+        return translated, False
     
-    # Check dictionary first
-    if source == "en" and target == "mr":
-        if text_lower in dict_data["en_to_mr"]:
-            return dict_data["en_to_mr"][text_lower], True
-    elif source == "mr" and target == "en":
-        if text in dict_data["mr_to_en"]:
-            return dict_data["mr_to_en"][text], True
-    
-    # Fallback to IndicTrans2 model
+    # Fallback to IndicTrans2 model. Only full-quality results are cached,
+    # not ones decoded with fewer beams because of load or a latency budget.
     try:
-        translated = translate_with_indictrans2(text, source, target)
+        future = scheduler.submit(text, source, target, quality, latency_budget_ms)
+        translated = future.result()
+        TEXTS_TOTAL.labels("model").inc()
+        if future.full_quality:
+            cache_put(key, translated)
         return translated, False
     except Exception as e:
         print(f"Translation error: {e}")
+        ERRORS_TOTAL.labels("translation").inc()
         return text, False
 
+class InflightTranslations:
+    """
+    Model translations that are queued or running, keyed like the cache
+    
+    An identical text submitted meanwhile, by the same request or another
+    one, waits on the existing future instead of running its own inference
+    and extends its Deadline. Entries are removed as soon as the translation
+    completes; from then on the cache answers.
+    """
+    
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+        
+        # Stats
+        self.owned = 0
+        self.coalesced = 0
+    
+    def join(self, key, deadline_at=None):
+        """
+        Return (future, owner, deadline) for key: the future of the
+        translation in flight, or a new one that the caller (owner=True) must
+        resolve. The caller must leave() the Deadline if it stops waiting.
+        """
+        with self._lock:
+            entry = self._futures.get(key)
+            # An expired translation is about to be dropped; start over
+            if entry is not None and not entry[1].expired():
+                entry[1].join(deadline_at)
+                self.coalesced += 1
+                return entry[0], False, entry[1]
+            future = Future()
+            deadline = Deadline(deadline_at)
+            self._futures[key] = (future, deadline)
+            self.owned += 1
+        future.add_done_callback(lambda _: self._discard(key, future))
+        return future, True, deadline
+    
+    def _discard(self, key, future):
+        with self._lock:
+            entry = self._futures.get(key)
+            if entry is not None and entry[0] is future:
+                del self._futures[key]
+    
+    def stats(self):
+        with self._lock:
+            total = self.owned + self.coalesced
+            return {
+                "in_flight": len(self._futures),
+                "submitted": self.owned,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0
+            }
+
+inflight = InflightTranslations()
+
+def _chain(source, target):
+    """Resolve the target future with the outcome (and full_quality) of the source future"""
+    def copy(_):
+        target.full_quality = getattr(source, "full_quality", False)
+        error = source.exception()
+        if error is not None:
+            target.set_exception(error)
+        else:
+            target.set_result(source.result())
+    source.add_done_callback(copy)
+
+class PendingTranslations:
+    """
+    Translations started by submit_texts(): dictionary and cache hits are
+    filled in immediately, the rest resolve as the scheduler finishes them
+    Duplicates share one future; only the submitting (owned) item counts as
+    a model translation and is cached, if it was decoded at full quality
+    (see BatchScheduler.submit_many). Waiting raises DeadlineExceeded once
+    deadline_at passes; release() gives up on whatever is still queued.
+    """
+    
+    def __init__(self, texts, translations, pending, futures, keys, owned=None, deadlines=(), deadline_at=None):
+        self.texts = texts
+        self.translations = translations
+        self.pending = pending
+        self.futures = futures
+        self.keys = keys
+        self.owned = set(pending) if owned is None else owned
+        self.deadlines = deadlines
+        self.deadline_at = deadline_at
+        self._released = False
+    
+    def _timeout(self):
+        return None if self.deadline_at is None else max(0.0, self.deadline_at - time.monotonic())
+    
+    def release(self):
+        """Stop waiting: queued translations nobody else waits for are dropped"""
+        if self._released:
+            return
+        self._released = True
+        for future, deadline in zip(self.futures, self.deadlines):
+            if not future.done():
+                deadline.leave()
+    
+    def _resolve(self, i, future):
+        try:
+            self.translations[i] = future.result(self._timeout())
+            if i in self.owned:
+                TEXTS_TOTAL.labels("model").inc()
+                if future.full_quality:
+                    cache_put(self.keys[i], self.translations[i])
+        except (DeadlineExceeded, FutureTimeoutError):
+            self.release()
+            raise DeadlineExceeded("Deadline exceeded before the translation finished")
+        except Exception as e:
+            print(f"Translation error: {e}")
+            ERRORS_TOTAL.labels("translation").inc()
+            self.translations[i] = self.texts[i]
+        return self.translations[i]
+    
+    def results(self):
+        """Wait for every translation, returns them in input order"""
+        for i, future in zip(self.pending, self.futures):
+            self._resolve(i, future)
+        return self.translations
+    
+    def iter_completed(self):
+        """Yield (index, translation) pairs as they become available"""
+        waiting = set(self.pending)
+        for i, translation in enumerate(self.translations):
+            if i not in waiting:
+                yield i, translation
+        
+        indices_of = {}
+        for i, future in zip(self.pending, self.futures):
+            indices_of.setdefault(future, []).append(i)
+        try:
+            for future in as_completed(indices_of, self._timeout()):
+                for i in indices_of[future]:
+                    yield i, self._resolve(i, future)
+        except FutureTimeoutError:
+            raise DeadlineExceeded("Deadline exceeded before the translation finished")
+        finally:
+            # Also reached when the consumer stops early (client went away)
+            self.release()
+
+def submit_texts(texts, source, target, quality=DEFAULT_QUALITY, latency_budget_ms=None,
+                 priority=PRIORITY_INTERACTIVE, admit=True, deadline_at=None):
+    """
+    Start translating a list of texts, dictionary first, then the cache
+    Texts already being translated (repeated in this list or submitted by a
+    concurrent request) join that translation; every other item is submitted
+    to the scheduler at once so the model sees length-bucketed batches
+    instead of one sentence per call. Returns a PendingTranslations.
+    Raises Overloaded, before anything is queued, when admission control
+    rejects the texts that need the model (unless admit is False).
+    deadline_at (time.monotonic()) bounds how long the work stays queued.
+    """
+    translations = [""] * len(texts)
+    pending = []
+    keys = {}
+    
+    for i, t in enumerate(texts):
+        if not t or not t.strip():
+            continue
+        
+        translated = lookup_dict(t, source, target)
+        if translated is not None:
+            TEXTS_TOTAL.labels("dictionary").inc()
+            translations[i] = translated
+            continue
+        
+        keys[i] = cache_key(t, source, target, quality)
+        translated = cache_get(keys[i])
+        if translated is not None:
+            TEXTS_TOTAL.labels("cache").inc()
+            translations[i] = translated
+        else:
+            pending.append(i)
+    
+    if admit and pending:
+        scheduler.admit(len(pending), priority)
+    
+    # Only translations expected to be decoded the same way are shared;
+    # whether a result is cached is decided by the beams it actually got
+    full_quality = latency_budget_ms is None and not scheduler.under_load()
+    futures = []
+    deadlines = []
+    owned = []
+    owned_futures = []
+    owned_deadlines = []
+    for i in pending:
+        future, owner, deadline = inflight.join((keys[i], full_quality, priority), deadline_at)
+        futures.append(future)
+        deadlines.append(deadline)
+        if owner:
+            owned.append(i)
+            owned_futures.append(future)
+            owned_deadlines.append(deadline)
+        else:
+            TEXTS_TOTAL.labels("coalesced").inc()
+    
+    if owned:
+        try:
+            submitted = scheduler.submit_many(
+                [texts[i] for i in owned], source, target, quality, latency_budget_ms, priority, owned_deadlines
+            )
+            for scheduled, future in zip(submitted, owned_futures):
+                _chain(scheduled, future)
+        except Exception as e:
+            print(f"Translation error: {e}")
+            for future in owned_futures:
+                if not future.done():
+                    future.set_exception(e)
+    
+    return PendingTranslations(
+        texts, translations, pending, futures, keys, set(owned), deadlines, deadline_at
+    )
+
+def translate_texts(texts, source, target, quality=DEFAULT_QUALITY, latency_budget_ms=None, deadline_at=None):
+    """
+    Translate a list of texts; empty strings, dictionary and cache hits keep
+    their position in the output. Raises DeadlineExceeded after deadline_at.
+    """
+    return submit_texts(texts, source, target, quality, latency_budget_ms, deadline_at=deadline_at).results()
+
+def stream_translations(texts, source, target, quality=DEFAULT_QUALITY, latency_budget_ms=None, deadline_at=None,
+                        window_timeout_ms=None):
+    """
+    Return a generator of {index, translatedText} records as translations complete
+    Works through the list one window at a time with the next window already
+    queued, so the model stays busy while results are written out and the
+    full response is never held in memory. The first window is submitted
+    before returning, so admission control can still reject the request
+    before a streaming response starts; later windows are not rejected.
+    deadline_at bounds the whole stream; window_timeout_ms bounds each window
+    from when it is queued, so long streams are not cut off by a per-request
+    default. When either passes the stream ends with an {"error": ...} record.
+    """
+    window = max(1, STREAM_WINDOW)
+    first = submit_texts(
+        texts[:window], source, target, quality, latency_budget_ms,
+        deadline_at=_window_deadline(deadline_at, window_timeout_ms)
+    )
+    return _stream_windows(first, texts, window, source, target, quality, latency_budget_ms, deadline_at, window_timeout_ms)
+
+def _window_deadline(deadline_at, window_timeout_ms):
+    """The earlier of the stream deadline and a window deadline starting now"""
+    window_deadline_at = request_deadline(window_timeout_ms)
+    if deadline_at is None or window_deadline_at is None:
+        return deadline_at if window_deadline_at is None else window_deadline_at
+    return min(deadline_at, window_deadline_at)
+
+def _stream_windows(current, texts, window, source, target, quality, latency_budget_ms, deadline_at, window_timeout_ms):
+    following = None
+    try:
+        for start in range(0, len(texts), window):
+            following = None
+            if start + window < len(texts):
+                following = submit_texts(
+                    texts[start + window:start + 2 * window], source, target, quality, latency_budget_ms,
+                    admit=False, deadline_at=_window_deadline(deadline_at, window_timeout_ms)
+                )
+            
+            for i, translated in current.iter_completed():
+                yield {"index": start + i, "translatedText": translated}
+            current = following
+    except DeadlineExceeded as e:
+        yield {"error": str(e)}
+    finally:
+        # A closed stream (client went away) drops the windows still queued
+        for pending in (current, following):
+            if pending is not None:
+                pending.release()
+
+# format=html: only text nodes go to the model; markup is copied through
+HTML_SKIP_TAGS = {"script", "style", "code", "pre", "textarea", "svg", "math"}
+HTML_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+HTML_TEXT_RE = re.compile(r"[^\W\d_]")  # nodes without letters (numbers, symbols) are kept
+
+class _HtmlTextExtractor(HTMLParser):
+    """
+    Splits markup into consecutive raw pieces, one per parser event, and
+    records the text of translatable text nodes. Content of HTML_SKIP_TAGS
+    and of elements marked translate="no" is left alone.
+    """
+    
+    def __init__(self, markup):
+        super().__init__(convert_charrefs=True)
+        self.markup = markup
+        self.events = []  # (offset in markup, unescaped text or None)
+        self._skip = []
+        # getpos() counts only \n as a line break, unlike str.splitlines()
+        self._line_offsets = [0]
+        for line in markup.split("\n"):
+            self._line_offsets.append(self._line_offsets[-1] + len(line) + 1)
+    
+    def _mark(self, text=None):
+        line, column = self.getpos()
+        self.events.append((self._line_offsets[line - 1] + column, text))
+    
+    def handle_starttag(self, tag, attrs):
+        self._mark()
+        if tag not in HTML_VOID_TAGS and (self._skip or tag in HTML_SKIP_TAGS or dict(attrs).get("translate") == "no"):
+            self._skip.append(tag)
+    
+    def handle_endtag(self, tag):
+        self._mark()
+        if tag in self._skip:
+            while self._skip.pop() != tag:
+                pass
+    
+    def handle_data(self, data):
+        self._mark(None if self._skip else data)
+    
+    def handle_startendtag(self, tag, attrs):
+        self._mark()
+    
+    def handle_comment(self, data):
+        self._mark()
+    
+    def handle_decl(self, decl):
+        self._mark()
+    
+    def handle_pi(self, data):
+        self._mark()
+    
+    def unknown_decl(self, data):
+        self._mark()
+
+def html_segments(markup):
+    """
+    Split markup into (raw, text) pieces that concatenate back to it; text is
+    the unescaped content of a translatable text node, None for markup
+    """
+    parser = _HtmlTextExtractor(markup)
+    parser.feed(markup)
+    parser.close()
+    
+    segments = []
+    events = parser.events
+    for n, (start, text) in enumerate(events):
+        end = events[n + 1][0] if n + 1 < len(events) else len(markup)
+        if text is not None and not HTML_TEXT_RE.search(text):
+            text = None
+        segments.append((markup[start:end], text))
+    
+    # Never risk mangling a document the parser could not account for
+    if "".join(raw for raw, _ in segments) != markup:
+        return [(markup, None)]
+    return segments
+
+def translate_html(documents, source, target, quality=DEFAULT_QUALITY, latency_budget_ms=None, deadline_at=None):
+    """
+    Translate HTML documents, returns them with tags, attributes and
+    whitespace around text nodes unchanged. The text nodes of all documents
+    are deduplicated and translated together, so the model sees batches of
+    plain sentences and no markup tokens.
+    """
+    parsed = [html_segments(document) if document else [] for document in documents]
+    unique = {}
+    for segments in parsed:
+        for _, text in segments:
+            if text is not None:
+                unique.setdefault(text.strip(), None)
+    
+    texts = list(unique)
+    for text, translation in zip(texts, translate_texts(texts, source, target, quality, latency_budget_ms, deadline_at)):
+        unique[text] = translation
+    
+    translated = []
+    for document, segments in zip(documents, parsed):
+        pieces = []
+        for raw, text in segments:
+            if text is None:
+                pieces.append(raw)
+                continue
+            core = text.strip()
+            lead = text[:len(text) - len(text.lstrip())]
+            trail = text[len(text.rstrip()):]
+            pieces.append(lead + html.escape(unique[core], quote=False) + trail)
+        translated.append("".join(pieces) if segments else document)
+    return translated
+
+class JobStore:
+    """
+    Persistent SQLite queue for bulk translation jobs.
+    
+    Items and their translations are stored per row, so a job survives
+    restarts and resumes from its first untranslated item. Jobs whose worker
+    stops making progress for JOB_STALE_SECONDS are claimed again, and
+    finished jobs are purged JOB_RETENTION_SECONDS after they finished.
+    """
+    
+    PURGE_INTERVAL = 60.0
+    
+    def __init__(self, jobs_dir):
+        self.path = Path(jobs_dir) / "jobs.db"
+        self._connections = ThreadConnections(self._connect)
+        self._purged_at = 0.0
+    
+    def _conn(self):
+        return self._connections.get()
+    
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                quality TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                heartbeat REAL,
+                client TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+            CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated);
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                translation TEXT,
+                PRIMARY KEY (job_id, idx)
+            );
+        """)
+        if "client" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+            # Databases created before per-client quotas
+            try:
+                conn.execute("ALTER TABLE jobs ADD COLUMN client TEXT")
+            except sqlite3.OperationalError:
+                pass  # another process added it first
+        return conn
+    
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "status": row["status"],
+            "source": row["source"],
+            "target": row["target"],
+            "quality": row["quality"],
+            "progress": {"done": row["done"], "total": row["total"]},
+            "error": row["error"],
+            "created": row["created"],
+            "updated": row["updated"]
+        }
+    
+    def create(self, texts, source, target, quality, client=None, max_active=0):
+        """Queue a job, raises Overloaded if the client already has max_active unfinished jobs"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if max_active and client is not None:
+                active = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE client = ? AND status IN ('queued', 'running')", (client,)
+                ).fetchone()[0]
+                if active >= max_active:
+                    raise Overloaded(f"Too many unfinished jobs from this client ({active})", "job_quota", JOB_POLL_SECONDS)
+            conn.execute(
+                "INSERT INTO jobs (id, status, source, target, quality, total, created, updated, client) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, source, target, quality, len(texts), now, now, client)
+            )
+            conn.executemany(
+                "INSERT INTO job_items (job_id, idx, text) VALUES (?, ?, ?)",
+                ((job_id, i, text) for i, text in enumerate(texts))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(job_id)
+    
+    def get(self, job_id):
+        return self._job(self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+    
+    def claim(self):
+        """Mark the oldest queued (or stale running) job as running and return it"""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' OR (status = 'running' AND heartbeat < ?) "
+                "ORDER BY created LIMIT 1",
+                (now - JOB_STALE_SECONDS,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', heartbeat = ?, updated = ? WHERE id = ?",
+                    (now, now, row["id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"]) if row is not None else None
+    
+    def next_items(self, job_id, limit):
+        """Untranslated items as (index, text) pairs"""
+        return [tuple(row) for row in self._conn().execute(
+            "SELECT idx, text FROM job_items WHERE job_id = ? AND translation IS NULL ORDER BY idx LIMIT ?",
+            (job_id, limit)
+        )]
+    
+    def save_results(self, job_id, results):
+        """Store (index, translation) pairs and record progress"""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "UPDATE job_items SET translation = ? WHERE job_id = ? AND idx = ?",
+                ((translation, job_id, i) for i, translation in results)
+            )
+            conn.execute(
+                "UPDATE jobs SET done = done + ?, heartbeat = ?, updated = ? WHERE id = ?",
+                (len(results), now, now, job_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def finish(self, job_id, status, error=None):
+        """Complete or fail a running job (a cancelled job stays cancelled)"""
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ? AND status = 'running'",
+            (status, error, time.time(), job_id)
+        )
+    
+    def cancel(self, job_id):
+        """Cancel a queued or running job, returns False if it already finished"""
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = 'cancelled', updated = ? WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id)
+        )
+        return cursor.rowcount > 0
+    
+    def purge(self, retention_seconds=None):
+        """Delete jobs that finished more than retention_seconds ago, returns how many"""
+        retention = JOB_RETENTION_SECONDS if retention_seconds is None else retention_seconds
+        now = time.time()
+        if not retention or now - self._purged_at < self.PURGE_INTERVAL:
+            return 0
+        self._purged_at = now
+        
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            expired = [row["id"] for row in conn.execute(
+                "SELECT id FROM jobs WHERE status IN ('completed', 'failed', 'cancelled') AND updated < ?",
+                (now - retention,)
+            )]
+            conn.executemany("DELETE FROM job_items WHERE job_id = ?", ((job_id,) for job_id in expired))
+            conn.executemany("DELETE FROM jobs WHERE id = ?", ((job_id,) for job_id in expired))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(expired)
+    
+    def iter_results(self, job_id, page_size=1000):
+        """Yield (index, text, translation) rows a page at a time"""
+        last = -1
+        while True:
+            rows = self._conn().execute(
+                "SELECT idx, text, translation FROM job_items WHERE job_id = ? AND idx > ? ORDER BY idx LIMIT ?",
+                (job_id, last, page_size)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield tuple(row)
+            last = rows[-1][0]
+
+class JobWorkerPool:
+    """
+    Background threads that claim jobs and translate them in large batches
+    at bulk priority, reusing the loaded model through the scheduler
+    """
+    
+    def __init__(self, store, workers):
+        self.store = store
+        self.workers = max(0, int(workers))
+        self._threads = ForkSafeThread(self._run, "job-worker", self.workers)
+        self._wakeup = threading.Event()
+    
+    def ensure_started(self):
+        if self.workers:
+            self._threads.ensure_started()
+    
+    def notify(self):
+        self._wakeup.set()
+    
+    def _run(self):
+        while True:
+            try:
+                self.store.purge()
+                job = self.store.claim()
+            except sqlite3.Error as e:
+                print(f"⚠ Job queue unavailable: {e}")
+                job = None
+            
+            if job is None:
+                self._wakeup.wait(JOB_POLL_SECONDS)
+                self._wakeup.clear()
+                continue
+            
+            self._process(job)
+    
+    def _process(self, job):
+        job_id = job["id"]
+        try:
+            while True:
+                if self.store.get(job_id)["status"] != "running":
+                    return  # cancelled
+                
+                items = self.store.next_items(job_id, JOB_BATCH_SIZE)
+                if not items:
+                    self.store.finish(job_id, "completed")
+                    return
+                
+                translations = submit_texts(
+                    [text for _, text in items], job["source"], job["target"], job["quality"],
+                    priority=PRIORITY_BULK
+                ).results()
+                self.store.save_results(job_id, [(i, t) for (i, _), t in zip(items, translations)])
+        except Exception as e:
+            print(f"✗ Job {job_id} failed: {e}")
+            self.store.finish(job_id, "failed", str(e))
+
+job_store = JobStore(JOBS_DIR)
+job_workers = JobWorkerPool(job_store, JOB_WORKERS)
+
+if TRUSTED_PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
+class ConcurrencyLimiter:
+    """
+    Caps concurrent requests per client in this process, so one bulk caller
+    cannot hold every request thread while interactive users wait behind it
+    """
+    
+    def __init__(self, limit):
+        self.limit = max(0, int(limit))
+        self._active = {}
+        self._lock = threading.Lock()
+        
+        # Stats
+        self.rejected = 0
+    
+    def acquire(self, client):
+        """Take a slot for client, False when it already has limit requests running"""
+        with self._lock:
+            active = self._active.get(client, 0)
+            if self.limit and active >= self.limit:
+                self.rejected += 1
+                return False
+            self._active[client] = active + 1
+            return True
+    
+    def release(self, client):
+        with self._lock:
+            active = self._active.get(client, 0) - 1
+            if active > 0:
+                self._active[client] = active
+            else:
+                self._active.pop(client, None)
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "limit": self.limit or None,
+                "clients": len(self._active),
+                "active_requests": sum(self._active.values()),
+                "rejected": self.rejected
+            }
+
+request_limiter = ConcurrencyLimiter(API_KEY_MAX_CONCURRENCY)
+
+def client_id(data):
+    """
+    Who a /translate request counts against: a key listed in API_KEYS, else
+    the client address (behind TRUSTED_PROXY_HOPS proxies, the forwarded one).
+    Unknown keys count as no key, so new keys do not open new slots.
+    """
+    api_key = data.get('api_key') or request.headers.get('X-API-Key')
+    if api_key in API_KEYS:
+        return f"key:{api_key}"
+    return f"addr:{request.remote_addr}"
+
+def overloaded_response(error):
+    """429 with Retry-After for work rejected by admission control"""
+    REJECTED_TOTAL.labels(error.reason).inc()
+    return jsonify({
+        "error": str(error),
+        "retry_after": error.retry_after
+    }), 429, {"Retry-After": str(error.retry_after)}
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - started)
+    if response.status_code >= 500:
+        ERRORS_TOTAL.labels("server").inc()
+    elif response.status_code >= 400:
+        ERRORS_TOTAL.labels("client").inc()
+    return response
+
 @app.route('/')
 def home():
     """Home endpoint with API information"""
@@ -162,27 +3033,127 @@ def home():
         "endpoints": {
             "translate": "/translate (POST)",
             "health": "/health (GET)",
-            "languages": "/languages (GET)"
+            "languages": "/languages (GET)",
+            "stats": "/stats (GET)",
+            "cache": "/admin/cache (GET, DELETE)",
+            "dictionary": "/admin/dictionary (GET), /admin/dictionary/reload (POST)",
+            "jobs": "/jobs (POST), /jobs/<id> (GET, DELETE), /jobs/<id>/result (GET)",
+            "metrics": "/metrics",
+            "probes": "/live, /ready"
         }
     })
 
+@app.route('/live')
+def live():
+    """Liveness: the process is serving requests; never touches the model"""
+    return jsonify({"status": "alive"}), 200
+
+@app.route('/ready')
+def ready():
+    """Readiness: 200 once the model is loaded and warmed up"""
+    model_loader.start()
+    return jsonify({
+        "status": model_loader.status,
+        "error": model_loader.error
+    }), 200 if model_loader.status == "ready" else 503
+
 @app.route('/health')
 def health():
-    """Health check endpoint"""
+    """
+    Health check endpoint
+    Uses the last successful inference instead of running a translation:
+    unhealthy while loading, after a failed load, or when queued work has
+    not been picked up for HEALTH_STALL_SECONDS
+    """
+    model_loader.start()
+    waiting = scheduler.oldest_wait()
+    stalled = waiting > HEALTH_STALL_SECONDS
+    healthy = model_loader.status == "ready" and not stalled
+    
+    if healthy:
+        status = "healthy"
+    elif model_loader.status in ("loading", "warming", "not_started"):
+        status = "starting"
+    else:
+        status = "unhealthy"
+    
+    return jsonify({
+        "status": status,
+        "model": "IndicTrans2",
+        "model_status": model_loader.status,
+        "model_loaded": model is not None,
+        "backend": backend.name if backend else None,
+        "device": device,
+        "error": model_loader.error,
+        "last_inference_seconds_ago": round(time.time() - last_inference_at, 1) if last_inference_at else None,
+        "oldest_queued_seconds": round(waiting, 1)
+    }), 200 if healthy else 503
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Inference scheduler statistics (queue depth, achieved batch sizes)"""
+    return jsonify({
+        "scheduler": scheduler.stats(),
+        "cache": translation_cache.stats(),
+        "persistent_cache": persistent_cache.stats(),
+        "coalescing": inflight.stats(),
+        "processing": processing_stats(),
+        "admission": dict(request_limiter.stats(), queue_max_depth=QUEUE_MAX_DEPTH, queue_max_wait_ms=QUEUE_MAX_WAIT_MS),
+        "startup_seconds": startup_timings,
+        "models": model_registry.stats()
+    })
+
+def require_admin():
+    """Return an error response unless the request carries the admin key"""
+    if ADMIN_API_KEY:
+        if request.headers.get('X-Admin-Key') != ADMIN_API_KEY:
+            return jsonify({"error": "Invalid or missing admin key"}), 403
+        return None
+    
+    # No key configured: local use only. A forwarded request that reaches us
+    # from loopback came through a local proxy, not from this machine
+    forwarded = TRUSTED_PROXY_HOPS == 0 and 'X-Forwarded-For' in request.headers
+    if request.remote_addr not in ('127.0.0.1', '::1') or forwarded:
+        return jsonify({"error": "Admin endpoints are disabled; set ADMIN_API_KEY"}), 403
+    return None
+
+@app.route('/admin/dictionary', methods=['GET'])
+def admin_dictionary():
+    """Loaded dictionary source, size and load time"""
+    denied = require_admin()
+    if denied:
+        return denied
+    return jsonify(load_glossary().stats())
+
+@app.route('/admin/dictionary/reload', methods=['POST'])
+def admin_dictionary_reload():
+    """Reload translations_dict.json without restarting"""
+    denied = require_admin()
+    if denied:
+        return denied
+    
     try:
-        if model is None or tokenizer is None:
-            load_model()
-        return jsonify({
-            "status": "healthy",
-            "model": "IndicTrans2",
-            "model_loaded": model is not None,
-            "device": device
-        }), 200
+        elapsed_ms = reload_translations_dict()
     except Exception as e:
+        return jsonify({"error": f"Reload failed, keeping the previous dictionary: {e}"}), 500
+    return jsonify(dict(load_glossary().stats(), reload_ms=round(elapsed_ms, 2)))
+
+@app.route('/admin/cache', methods=['GET', 'DELETE'])
+def admin_cache():
+    """Inspect (GET) or clear (DELETE) the translation caches"""
+    denied = require_admin()
+    if denied:
+        return denied
+    
+    if request.method == 'DELETE':
         return jsonify({
-            "status": "unhealthy",
-            "error": str(e)
-        }), 503
+            "cleared": translation_cache.clear(),
+            "persistent_cleared": persistent_cache.clear()
+        })
+    return jsonify({
+        "memory": translation_cache.stats(),
+        "persistent": persistent_cache.stats()
+    })
 
 @app.route('/languages', methods=['GET'])
 def languages():
@@ -200,6 +3171,50 @@ def languages():
         }
     ])
 
+def validate_translation_params(source, target, quality):
+    """Return an error response for unsupported parameters, or None"""
+    if not source or not target:
+        return jsonify({"error": "Missing 'source' or 'target' parameter"}), 400
+    
+    if source not in ['en', 'mr'] or target not in ['en', 'mr']:
+        return jsonify({"error": "Supported languages: 'en', 'mr'"}), 400
+    
+    if source == target:
+        return jsonify({"error": "Source and target languages must be different"}), 400
+    
+    if not isinstance(quality, str) or (quality != "auto" and quality not in QUALITY_BEAMS):
+        return jsonify({"error": "Supported quality values: 'auto', 'fast', 'balanced', 'best'"}), 400
+    
+    return None
+
+def streaming_format(data):
+    """"ndjson", "sse" or None for a /translate request"""
+    stream = data.get('stream')
+    if stream in ("ndjson", "sse"):
+        return stream
+    
+    accept = request.headers.get('Accept', '')
+    if 'text/event-stream' in accept:
+        return "sse"
+    if stream or 'application/x-ndjson' in accept:
+        return "ndjson"
+    return None
+
+def streaming_response(records, stream_format):
+    """Wrap a record generator as an NDJSON or server-sent events response"""
+    def generate():
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False)
+            yield f"data: {line}\n\n" if stream_format == "sse" else line + "\n"
+        if stream_format == "sse":
+            yield "event: done\ndata: {}\n\n"
+    
+    mimetype = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return Response(generate(), mimetype=mimetype, headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
 @app.route('/translate', methods=['POST'])
 def translate():
     """
@@ -209,8 +3224,27 @@ def translate():
     {
         "q": "text to translate" or ["text1", "text2"],
         "source": "en" or "mr",
-        "target": "mr" or "en"
+        "target": "mr" or "en",
+        "quality": "auto", "fast", "balanced" or "best" (optional),
+        "latency_budget_ms": 500 (optional),
+        "timeout_ms": 10000 (optional; without it REQUEST_TIMEOUT_MS applies,
+                             to each window of a streaming response),
+        "format": "text" or "html" (optional),
+        "stream": true, "ndjson" or "sse" (optional),
+        "api_key": "..." (optional, or an X-API-Key header; keys listed in
+                          API_KEYS get their own concurrency limit)
     }
+    
+    Streaming responses (also selected with an Accept header of
+    application/x-ndjson or text/event-stream) emit one
+    {"index": i, "translatedText": "..."} record per item as batches complete.
+    
+    With "format": "html" only text nodes are translated; tags and
+    attributes come back unchanged. Streaming is plain text only.
+    
+    Returns 429 with Retry-After when the translation queue is overloaded or
+    the client already has API_KEY_MAX_CONCURRENCY requests running, and
+    504 when the request's deadline passes first.
     """
     try:
         # Get request data
@@ -223,38 +3257,77 @@ def translate():
         text = data.get('q')
         source = data.get('source', '').lower()
         target = data.get('target', '').lower()
+        quality = data.get('quality', DEFAULT_QUALITY)
         
         # Validate parameters
         if not text:
             return jsonify({"error": "Missing 'q' parameter"}), 400
         
-        if not source or not target:
-            return jsonify({"error": "Missing 'source' or 'target' parameter"}), 400
+        error = validate_translation_params(source, target, quality)
+        if error:
+            return error
         
-        if source not in ['en', 'mr'] or target not in ['en', 'mr']:
-            return jsonify({"error": "Supported languages: 'en', 'mr'"}), 400
+        latency_budget_ms = data.get('latency_budget_ms')
+        if latency_budget_ms is not None:
+            if isinstance(latency_budget_ms, bool) or not isinstance(latency_budget_ms, (int, float)) or latency_budget_ms <= 0:
+                return jsonify({"error": "'latency_budget_ms' must be a positive number"}), 400
         
-        if source == target:
-            return jsonify({"error": "Source and target languages must be different"}), 400
+        timeout_ms = data.get('timeout_ms')
+        if timeout_ms is not None:
+            if isinstance(timeout_ms, bool) or not isinstance(timeout_ms, (int, float)) or timeout_ms < 0:
+                return jsonify({"error": "'timeout_ms' must be a non-negative number"}), 400
         
-        # Load model and dictionary if not loaded
-        if model is None or tokenizer is None:
-            load_model()
+        text_format = data.get('format', 'text')
+        if text_format not in ('text', 'html'):
+            return jsonify({"error": "Supported formats: 'text', 'html'"}), 400
+        
+        # Load the dictionary if not loaded; models load on first use per direction
         load_translations_dict()
         
         # Handle batch translation
         is_batch = isinstance(text, list)
         texts = text if is_batch else [text]
         
-        # Translate
-        translations = []
-        for t in texts:
-            if not t or not t.strip():
-                translations.append("")
-                continue
+        client = client_id(data)
+        if not request_limiter.acquire(client):
+            return overloaded_response(Overloaded("Too many concurrent requests from this client", "concurrency"))
+        
+        streaming = False
+        try:
+            # Streaming: NDJSON lines or server-sent events, one record per item
+            stream_format = streaming_format(data)
+            if stream_format and text_format == 'html':
+                return jsonify({"error": "Streaming is not supported with format 'html'"}), 400
+            if stream_format:
+                # An explicit timeout covers the whole stream; the server
+                # default only bounds each window, however long the stream
+                if timeout_ms is not None:
+                    records = stream_translations(
+                        texts, source, target, quality, latency_budget_ms, request_deadline(timeout_ms)
+                    )
+                else:
+                    records = stream_translations(
+                        texts, source, target, quality, latency_budget_ms, window_timeout_ms=REQUEST_TIMEOUT_MS
+                    )
+                response = streaming_response(records, stream_format)
+                # The slot is held until the stream is fully written or the client goes away
+                response.call_on_close(lambda: request_limiter.release(client))
+                streaming = True
+                return response
             
-            translated, from_dict = translate_with_dict(t, source, target)
-            translations.append(translated)
+            # Translate (dictionary hits inline, the rest as batched generate calls)
+            deadline_at = request_deadline(REQUEST_TIMEOUT_MS if timeout_ms is None else timeout_ms)
+            if text_format == 'html':
+                translations = translate_html(texts, source, target, quality, latency_budget_ms, deadline_at)
+            else:
+                translations = translate_texts(texts, source, target, quality, latency_budget_ms, deadline_at)
+        except Overloaded as e:
+            return overloaded_response(e)
+        except DeadlineExceeded as e:
+            return jsonify({"error": str(e)}), 504
+        finally:
+            if not streaming:
+                request_limiter.release(client)
         
         # Return response
         response = {
@@ -273,6 +3346,101 @@ def translate():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Submit a bulk translation job
+    
+    JSON body: {"q": ["text1", "text2", ...], "source": "en", "target": "mr", "quality": "best"}
+    or a JSONL body (one {"q": "..."} record or JSON string per line) with
+    source, target and quality as query parameters.
+    Returns 202 with the job; poll /jobs/<id> and fetch /jobs/<id>/result.
+    A client (see client_id) may have JOB_MAX_ACTIVE_PER_CLIENT unfinished
+    jobs; more are rejected with 429. Finished jobs are kept for
+    JOB_RETENTION_SECONDS.
+    """
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Body must be a JSON object"}), 400
+        texts = data.get('q')
+    else:
+        data = request.args
+        texts = []
+        try:
+            for line in request.get_data(as_text=True).splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                texts.append(record.get('q') if isinstance(record, dict) else record)
+        except (ValueError, AttributeError):
+            return jsonify({"error": "Body must be JSON or JSONL"}), 400
+    
+    source = str(data.get('source', '')).lower()
+    target = str(data.get('target', '')).lower()
+    quality = data.get('quality', DEFAULT_QUALITY)
+    
+    if not texts or not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({"error": "'q' must be a non-empty list of strings"}), 400
+    if len(texts) > JOB_MAX_ITEMS:
+        return jsonify({"error": f"Jobs are limited to {JOB_MAX_ITEMS} items"}), 400
+    
+    error = validate_translation_params(source, target, quality)
+    if error:
+        return error
+    
+    try:
+        job = job_store.create(texts, source, target, quality, client_id(data), JOB_MAX_ACTIVE_PER_CLIENT)
+    except Overloaded as e:
+        return overloaded_response(e)
+    job_workers.ensure_started()
+    job_workers.notify()
+    return jsonify(job), 202, {"Location": f"/jobs/{job['id']}"}
+
+@app.route('/jobs/<job_id>', methods=['GET', 'DELETE'])
+def job_status(job_id):
+    """Job status and progress (GET), or cancel the job (DELETE)"""
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    if request.method == 'DELETE':
+        if not job_store.cancel(job_id):
+            return jsonify({"error": f"Job already {job['status']}"}), 409
+        job = job_store.get(job_id)
+    
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """
+    Translations of a completed job: {"translatedText": [...]}, or NDJSON
+    {index, translatedText} records with ?format=jsonl or an NDJSON Accept
+    header. Add ?partial=1 to read results of an unfinished job.
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    if job["status"] != "completed" and request.args.get('partial') not in ('1', 'true'):
+        return jsonify({"error": f"Job is {job['status']}", "job": job}), 409
+    
+    rows = job_store.iter_results(job_id)
+    if request.args.get('format') == 'jsonl' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        records = ({"index": i, "translatedText": translation} for i, _, translation in rows)
+        return streaming_response(records, "ndjson")
+    
+    return jsonify({"translatedText": [translation for _, _, translation in rows]})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics, aggregated across worker processes when PROMETHEUS_MULTIPROC_DIR is set"""
+    registry = REGISTRY
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
 @app.errorhandler(404)
 def not_found(e):
     return jsonify({"error": "Endpoint not found"}), 404
@@ -288,8 +3456,9 @@ if __name__ == '__main__':
     print("=" * 60)
     
     try:
-        load_translations_dict()
-        load_model()
+        # The model loads and warms up in the background; /ready reports progress
+        model_loader.start()
+        job_workers.ensure_started()  # resume queued jobs
         print("\nStarting server...")
         
         # Get port from environment or use default (7860 for HF Spaces)
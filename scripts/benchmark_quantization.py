@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Compare fp32 and dynamic int8 (QUANTIZE=int8) inference on CPU.
+
+Each variant runs in its own process so RSS is measured cleanly. Reports
+load time, single-sentence latency, batched throughput, RSS and chrF/BLEU
+against references (or against the fp32 output when the test set has none).
+
+Test set: a TSV file (source<TAB>reference) or a JSONL file with {q, s}
+records as written by scripts/suggestions-to-jsonl.py.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_SENTENCES = [
+    "Hello, how are you?",
+    "Please save your changes before you log out.",
+    "Your booking has been confirmed for tomorrow morning.",
+    "The driver will arrive at the pickup location in ten minutes.",
+    "Thank you for using our service.",
+    "We could not process your payment. Please try again.",
+    "Notifications are turned off for this event.",
+    "Search for events near you and invite your friends.",
+]
+
+
+def load_test_set(path, limit):
+    """Return (sources, references); references may be None"""
+    if not path:
+        return DEFAULT_SENTENCES[:limit], None
+
+    sources, references = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if path.endswith('.jsonl'):
+                record = json.loads(line)
+                sources.append(record['q'])
+                references.append(record.get('s'))
+            else:
+                parts = line.split('\t')
+                sources.append(parts[0])
+                references.append(parts[1] if len(parts) > 1 else None)
+            if len(sources) >= limit:
+                break
+
+    if any(r is None for r in references):
+        references = None
+    return sources, references
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def run_variant(args):
+    """Child process: load one variant, time it and print a JSON result"""
+    sys.path.append(ROOT)
+    os.chdir(ROOT)
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    import app
+
+    sources, _ = load_test_set(args.test_set, args.limit)
+    rss_before = current_rss_mb()
+
+    start = time.perf_counter()
+    app.load_model()
+    load_s = time.perf_counter() - start
+
+    # Warm up
+    app.translate_batch_with_indictrans2(sources[:1], args.source, args.target)
+
+    latencies = []
+    for _ in range(args.runs):
+        for text in sources:
+            start = time.perf_counter()
+            app.translate_batch_with_indictrans2([text], args.source, args.target)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    outputs = app.translate_batch_with_indictrans2(sources, args.source, args.target)
+    batch_s = time.perf_counter() - start
+
+    latencies.sort()
+    print(json.dumps({
+        "variant": args.variant,
+        "load_s": round(load_s, 3),
+        "latency_ms_p50": round(statistics.median(latencies), 2),
+        "latency_ms_p95": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+        "throughput_sentences_per_s": round(len(sources) / batch_s, 2),
+        "rss_mb": round(current_rss_mb(), 1),
+        "model_rss_mb": round(current_rss_mb() - rss_before, 1),
+        "outputs": outputs
+    }, ensure_ascii=False))
+
+
+def spawn_variant(args, variant):
+    env = dict(os.environ)
+    env['QUANTIZE'] = 'int8' if variant == 'int8' else ''
+    cmd = [
+        sys.executable, os.path.abspath(__file__),
+        '--variant', variant,
+        '--source', args.source,
+        '--target', args.target,
+        '--limit', str(args.limit),
+        '--runs', str(args.runs),
+        '--threads', str(args.threads),
+    ]
+    if args.test_set:
+        cmd += ['--test-set', os.path.abspath(args.test_set)]
+
+    print(f"Running {variant}...")
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stdout)
+        print(result.stderr)
+        raise RuntimeError(f"{variant} run failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def score(hypotheses, references):
+    """chrF and BLEU, or None if sacrebleu is not installed"""
+    try:
+        import sacrebleu
+    except ImportError:
+        return None
+    return {
+        "chrf": round(sacrebleu.corpus_chrf(hypotheses, [references]).score, 2),
+        "bleu": round(sacrebleu.corpus_bleu(hypotheses, [references]).score, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fp32 vs int8 speed/quality report")
+    parser.add_argument('--test-set', type=str, default=None, help="TSV (source<TAB>reference) or JSONL ({q, s}) file")
+    parser.add_argument('--source', type=str, default='en')
+    parser.add_argument('--target', type=str, default='mr')
+    parser.add_argument('--limit', type=int, default=200, help="Maximum number of test sentences")
+    parser.add_argument('--runs', type=int, default=1, help="Latency passes over the test set")
+    parser.add_argument('--threads', type=int, default=0, help="torch intra-op threads (0 = torch default)")
+    parser.add_argument('--output', type=str, default=None, help="Write the JSON report here")
+    parser.add_argument('--variant', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args)
+        return
+
+    sources, references = load_test_set(args.test_set, args.limit)
+    fp32 = spawn_variant(args, 'fp32')
+    int8 = spawn_variant(args, 'int8')
+
+    # Without references, fp32 output is the reference for the int8 run
+    baseline = references or fp32['outputs']
+    fp32_quality = score(fp32['outputs'], references) if references else None
+    int8_quality = score(int8['outputs'], baseline)
+
+    report = {
+        "sentences": len(sources),
+        "references": "test set" if references else "fp32 output",
+        "fp32": {k: v for k, v in fp32.items() if k != 'outputs'},
+        "int8": {k: v for k, v in int8.items() if k != 'outputs'},
+        "quality": {"fp32": fp32_quality, "int8": int8_quality},
+        "speedup": round(fp32['latency_ms_p50'] / int8['latency_ms_p50'], 2) if int8['latency_ms_p50'] else None,
+        "rss_saved_mb": round(fp32['rss_mb'] - int8['rss_mb'], 1)
+    }
+    if fp32_quality and int8_quality:
+        report["quality"]["delta"] = {k: round(int8_quality[k] - fp32_quality[k], 2) for k in int8_quality}
+
+    print()
+    print("=" * 60)
+    print(f"{'':28}{'fp32':>14}{'int8':>14}")
+    for key in ('load_s', 'latency_ms_p50', 'latency_ms_p95', 'throughput_sentences_per_s', 'rss_mb'):
+        print(f"{key:28}{fp32[key]:>14}{int8[key]:>14}")
+    print("=" * 60)
+    if int8_quality is None:
+        print("⚠ sacrebleu not installed, skipping chrF/BLEU (pip install sacrebleu)")
+    else:
+        print(f"Quality vs {report['references']}: fp32={fp32_quality} int8={int8_quality}")
+    print(f"Speedup (p50): {report['speedup']}x, RSS saved: {report['rss_saved_mb']} MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Compile translations_dict.json into the binary glossary index loaded by app.py.
+Running servers pick up the new index through their dictionary file watch.
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import app
+
+if __name__ == "__main__":
+    if not app.DICT_PATH.exists():
+        print(f"✗ Dictionary not found: {app.DICT_PATH}")
+        sys.exit(1)
+
+    start = time.time()
+    compiled = app.build_glossary(use_index=False, write_index=True)
+
+    stats = compiled.stats()
+    print(f"✓ Wrote {app.DICT_INDEX_PATH} in {(time.time() - start) * 1000:.0f} ms")
+    for direction, count in stats["phrases"].items():
+        print(f"  • {direction}: {count} phrases")
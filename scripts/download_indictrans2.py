@@ -2,21 +2,67 @@
 """
 Download AI4Bharat IndicTrans2 model for English ↔ Marathi translation.
 This model provides high-quality translations for Indic languages.
+
+Downloads the en→indic checkpoint (the default model) and the indic→en
+checkpoint, which the server loads on first Marathi → English request.
+
+Weights are kept as safetensors, which load without unpickling and are
+memory-mapped at startup. A pickled pytorch_model.bin is converted.
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
 
-def download_model():
-    """Download the IndicTrans2 English-Marathi model from HuggingFace."""
+# Distilled checkpoints per direction, stored where app.MODEL_DIRS expects them
+MODELS = {
+    'en-indic': ('ai4bharat/indictrans2-en-indic-dist-200M', Path('./models/indictrans2-en-mr')),
+    'indic-en': ('ai4bharat/indictrans2-indic-en-dist-200M', Path('./models/indictrans2-mr-en')),
+}
+
+def has_weights(local_dir):
+    return (local_dir / 'model.safetensors').exists() or (local_dir / 'pytorch_model.bin').exists()
+
+def convert_to_safetensors(local_dir):
+    """Convert pytorch_model.bin to model.safetensors and remove the pickle"""
+    bin_path = local_dir / 'pytorch_model.bin'
+    safetensors_path = local_dir / 'model.safetensors'
+    if safetensors_path.exists() or not bin_path.exists():
+        return True
+    
+    print("Converting pytorch_model.bin to model.safetensors...")
+    try:
+        import torch
+        from safetensors.torch import save_file
+        
+        state_dict = torch.load(bin_path, map_location='cpu', weights_only=True)
+        
+        # safetensors cannot store tensors sharing memory (tied embeddings);
+        # transformers ties them again when loading
+        seen = set()
+        for name, tensor in state_dict.items():
+            pointer = tensor.untyped_storage().data_ptr()
+            state_dict[name] = tensor.clone().contiguous() if pointer in seen else tensor.contiguous()
+            seen.add(pointer)
+        
+        save_file(state_dict, str(safetensors_path), metadata={'format': 'pt'})
+        bin_path.unlink()
+        print(f"✓ Wrote {safetensors_path.name} ({safetensors_path.stat().st_size / (1024 * 1024):.1f} MB)")
+        return True
+    except Exception as e:
+        print(f"⚠ Could not convert to safetensors, keeping pytorch_model.bin: {e}")
+        safetensors_path.unlink(missing_ok=True)
+        return False
+
+def download_model(direction='en-indic'):
+    """Download one direction of the IndicTrans2 English-Marathi model from HuggingFace."""
     
     # Using the distilled model for better performance
-    model_id = 'ai4bharat/indictrans2-en-indic-dist-200M'
-    local_dir = Path('./models/indictrans2-en-mr')
+    model_id, local_dir = MODELS[direction]
     
     print("=" * 60)
-    print("Downloading IndicTrans2 Model for English ↔ Marathi")
+    print(f"Downloading IndicTrans2 Model ({direction})")
     print("=" * 60)
     print(f"Model: {model_id}")
     print(f"Target: {local_dir.absolute()}")
@@ -28,7 +74,7 @@ def download_model():
     print()
     
     try:
-        from huggingface_hub import snapshot_download
+        from huggingface_hub import list_repo_files, snapshot_download
         
         # Create models directory if it doesn't exist
         local_dir.parent.mkdir(parents=True, exist_ok=True)
@@ -36,12 +82,13 @@ def download_model():
         # Check if model already exists
         if local_dir.exists() and (local_dir / 'config.json').exists():
             print("Model directory already exists. Checking files...")
-            required_files = ['config.json', 'pytorch_model.bin', 'tokenizer_config.json']
+            required_files = ['config.json', 'tokenizer_config.json']
             existing_files = [f for f in required_files if (local_dir / f).exists()]
             
-            if len(existing_files) >= 2:
-                print(f"✓ Found {len(existing_files)} model files")
+            if len(existing_files) >= 1 and has_weights(local_dir):
+                print(f"✓ Found {len(existing_files) + 1} model files")
                 print("Skipping download (model already present)")
+                convert_to_safetensors(local_dir)
                 print()
                 print("To force re-download, delete the models directory:")
                 print(f"  rm -rf {local_dir}")
@@ -52,12 +99,17 @@ def download_model():
         print("Model size: ~800MB")
         print()
         
+        # Prefer the published safetensors; only fetch the pickle without them
+        ignore_patterns = ["*.h5", "*.ot", "*.msgpack"]
+        if any(f.endswith('.safetensors') for f in list_repo_files(model_id)):
+            ignore_patterns.append("*.bin")
+        
         downloaded_path = snapshot_download(
             repo_id=model_id,
             local_dir=str(local_dir),
             local_dir_use_symlinks=False,
             resume_download=True,
-            ignore_patterns=["*.h5", "*.ot", "*.msgpack", "*.safetensors"]
+            ignore_patterns=ignore_patterns
         )
         
         print()
@@ -68,14 +120,18 @@ def download_model():
         print()
         
         # Verify model files
-        required_files = ['config.json', 'pytorch_model.bin']
+        required_files = ['config.json']
         missing_files = [f for f in required_files if not (local_dir / f).exists()]
+        if not has_weights(local_dir):
+            missing_files.append('model.safetensors')
         
         if missing_files:
             print(f"✗ ERROR: Missing required files: {missing_files}")
             print("Download may have failed. Please try again.")
             return False
         
+        convert_to_safetensors(local_dir)
+        
         # List all downloaded files
         all_files = list(local_dir.glob('*'))
         print(f"Downloaded {len(all_files)} files:")
@@ -121,5 +177,10 @@ def download_model():
         return False
 
 if __name__ == "__main__":
-    success = download_model()
+    parser = argparse.ArgumentParser(description="Download the IndicTrans2 checkpoints")
+    parser.add_argument('--direction', choices=['all'] + list(MODELS), default='all')
+    args = parser.parse_args()
+    
+    directions = list(MODELS) if args.direction == 'all' else [args.direction]
+    success = all([download_model(direction) for direction in directions])
     sys.exit(0 if success else 1)
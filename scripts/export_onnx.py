@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Export the IndicTrans2 checkpoint to ONNX for INFERENCE_BACKEND=onnx.
+
+Writes three graphs plus export_config.json to models/indictrans2-en-mr/onnx:
+  • encoder.onnx            input_ids, attention_mask -> encoder hidden states
+  • decoder.onnx            first decoding step, returns the full attention cache
+  • decoder_with_past.onnx  later steps, reuses the cache and returns the
+                            updated self attention cache
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+
+import torch
+from transformers import AutoModelForSeq2SeqLM
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+OPSET = 17
+
+
+class EncoderWrapper(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.encoder = model.get_encoder()
+
+    def forward(self, input_ids, attention_mask):
+        return self.encoder(input_ids=input_ids, attention_mask=attention_mask, return_dict=True).last_hidden_state
+
+
+class DecoderWrapper(torch.nn.Module):
+    """Decoder + LM head; with_past takes and returns the attention cache as flat tensors"""
+
+    def __init__(self, model, with_past):
+        super().__init__()
+        self.decoder = model.get_decoder()
+        self.lm_head = model.get_output_embeddings()
+        self.final_logits_bias = getattr(model, "final_logits_bias", None)
+        self.with_past = with_past
+
+    def forward(self, input_ids, encoder_hidden_states, encoder_attention_mask, *past):
+        past_key_values = None
+        if self.with_past:
+            past_key_values = tuple(tuple(past[i:i + 4]) for i in range(0, len(past), 4))
+
+        outputs = self.decoder(
+            input_ids=input_ids,
+            encoder_hidden_states=encoder_hidden_states,
+            encoder_attention_mask=encoder_attention_mask,
+            past_key_values=past_key_values,
+            use_cache=True,
+            return_dict=True
+        )
+        logits = self.lm_head(outputs.last_hidden_state)
+        if self.final_logits_bias is not None:
+            logits = logits + self.final_logits_bias
+
+        present = []
+        for layer in outputs.past_key_values:
+            # Cross attention cache never changes after the first step
+            present.extend(layer[:2] if self.with_past else layer)
+        return (logits, *present)
+
+
+def export(module, args, path, input_names, output_names, dynamic_axes):
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False
+    torch.onnx.export(
+        module, args, str(path),
+        input_names=input_names,
+        output_names=output_names,
+        dynamic_axes=dynamic_axes,
+        opset_version=OPSET,
+        do_constant_folding=True,
+        **kwargs
+    )
+    print(f"  • {path.name} ({path.stat().st_size / (1024 * 1024):.1f} MB)")
+
+
+def main():
+    import app
+
+    parser = argparse.ArgumentParser(description="Export IndicTrans2 to ONNX")
+    parser.add_argument("--model-dir", type=str, default=str(app.MODEL_DIR))
+    parser.add_argument("--output-dir", type=str, default=None, help="Defaults to <model-dir>/onnx")
+    parser.add_argument("--quantize", action="store_true", help="Also apply ONNX Runtime dynamic int8 quantization")
+    args = parser.parse_args()
+
+    model_dir = Path(args.model_dir)
+    output_dir = Path(args.output_dir) if args.output_dir else model_dir / "onnx"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Loading {model_dir}...")
+    model = AutoModelForSeq2SeqLM.from_pretrained(
+        str(model_dir),
+        local_files_only=True,
+        trust_remote_code=True
+    ).eval()
+    model.config.use_cache = True
+    config = model.config
+
+    num_layers = config.decoder_layers
+    input_ids = torch.tensor([[5, 6, 7, config.eos_token_id], [5, 6, config.eos_token_id, config.pad_token_id]])
+    attention_mask = (input_ids != config.pad_token_id).long()
+    decoder_ids = torch.full((2, 1), config.decoder_start_token_id, dtype=torch.long)
+
+    print(f"Exporting to {output_dir}...")
+    with torch.no_grad():
+        encoder = EncoderWrapper(model)
+        hidden = encoder(input_ids, attention_mask)
+        export(
+            encoder, (input_ids, attention_mask), output_dir / "encoder.onnx",
+            ["input_ids", "attention_mask"], ["last_hidden_state"],
+            {
+                "input_ids": {0: "batch", 1: "source"},
+                "attention_mask": {0: "batch", 1: "source"},
+                "last_hidden_state": {0: "batch", 1: "source"}
+            }
+        )
+
+        cache_names = []
+        for layer in range(num_layers):
+            cache_names += [f"past_key_{layer}", f"past_value_{layer}", f"cross_key_{layer}", f"cross_value_{layer}"]
+        first_axes = {
+            "input_ids": {0: "batch", 1: "target"},
+            "encoder_hidden_states": {0: "batch", 1: "source"},
+            "encoder_attention_mask": {0: "batch", 1: "source"},
+            "logits": {0: "batch", 1: "target"}
+        }
+        present_names = [name.replace("past_", "present_").replace("cross_", "present_cross_") for name in cache_names]
+        for name in present_names:
+            first_axes[name] = {0: "batch", 2: "source" if "cross" in name else "target"}
+
+        decoder = DecoderWrapper(model, with_past=False)
+        first = decoder(decoder_ids, hidden, attention_mask)
+        export(
+            decoder, (decoder_ids, hidden, attention_mask), output_dir / "decoder.onnx",
+            ["input_ids", "encoder_hidden_states", "encoder_attention_mask"],
+            ["logits"] + present_names,
+            first_axes
+        )
+
+        past_axes = {
+            "input_ids": {0: "batch"},
+            "encoder_hidden_states": {0: "batch", 1: "source"},
+            "encoder_attention_mask": {0: "batch", 1: "source"},
+            "logits": {0: "batch"}
+        }
+        self_present = []
+        for layer in range(num_layers):
+            past_axes[f"past_key_{layer}"] = {0: "batch", 2: "past"}
+            past_axes[f"past_value_{layer}"] = {0: "batch", 2: "past"}
+            past_axes[f"cross_key_{layer}"] = {0: "batch", 2: "source"}
+            past_axes[f"cross_value_{layer}"] = {0: "batch", 2: "source"}
+            self_present += [f"present_key_{layer}", f"present_value_{layer}"]
+        for name in self_present:
+            past_axes[name] = {0: "batch", 2: "total"}
+
+        decoder = DecoderWrapper(model, with_past=True)
+        next_ids = first[0][:, -1:].argmax(-1)
+        export(
+            decoder, (next_ids, hidden, attention_mask, *first[1:]), output_dir / "decoder_with_past.onnx",
+            ["input_ids", "encoder_hidden_states", "encoder_attention_mask"] + cache_names,
+            ["logits"] + self_present,
+            past_axes
+        )
+
+    graphs = {"encoder": "encoder.onnx", "decoder": "decoder.onnx", "decoder_with_past": "decoder_with_past.onnx"}
+    if args.quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print("Quantizing (dynamic int8)...")
+        for key, name in graphs.items():
+            quantized = name.replace(".onnx", ".int8.onnx")
+            quantize_dynamic(str(output_dir / name), str(output_dir / quantized), weight_type=QuantType.QInt8)
+            graphs[key] = quantized
+            print(f"  • {quantized}")
+
+    export_config = dict(graphs, **{
+        "num_layers": num_layers,
+        "decoder_start_token_id": config.decoder_start_token_id,
+        "eos_token_id": config.eos_token_id,
+        "pad_token_id": config.pad_token_id
+    })
+    with open(output_dir / "export_config.json", 'w', encoding='utf-8') as f:
+        json.dump(export_config, f, indent=2)
+
+    print()
+    print("✓ Export complete. Start the server with INFERENCE_BACKEND=onnx")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,74 @@
-import re
-import sys
+"""
+Gunicorn settings for wsgi:app
 
-from prometheus_client import multiprocess
+The app is preloaded so model weights are loaded once in the master and
+shared copy-on-write by the workers. Cores are split between workers:
+each worker gets cores / workers torch intra-op threads so they do not
+oversubscribe the CPU.
+
+Environment:
+  WEB_CONCURRENCY   worker processes (default: cores / 4, at least 1)
+  TORCH_THREADS     torch threads per worker (default: cores / workers)
+  WORKER_THREADS    request threads per worker; concurrent requests are
+                    batched together by the scheduler (default: 8)
+"""
+
+import os
+import shutil
+import tempfile
+
+
+def available_cpus():
+    """CPUs this process may use, honouring affinity and cgroup quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+cpus = available_cpus()
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 7860)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", max(1, cpus // 4)))
+worker_class = "gthread"
+threads = int(os.environ.get("WORKER_THREADS", 8))
+preload_app = True
+timeout = 120
+graceful_timeout = 30
+
+torch_threads = int(os.environ.get("TORCH_THREADS", max(1, cpus // workers)))
+
+# Metrics from every worker are aggregated by /metrics. The directory has to
+# be set before prometheus_client is first imported, and is wiped on start.
+if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(tempfile.gettempdir(), "prometheus-multiproc")
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def when_ready(server):
+    server.log.info(f"{workers} workers x {torch_threads} torch threads on {cpus} CPUs")
+
+
+def post_fork(server, worker):
+    import torch
+    torch.set_num_threads(torch_threads)
+
+    # Background threads do not survive fork(): warm up the shared model and
+    # resume queued jobs in every worker
+    import app
+    app.model_loader.start()
+    app.job_workers.ensure_started()
 
 
 def child_exit(server, worker):
+    from prometheus_client import multiprocess
     multiprocess.mark_process_dead(worker.pid)
-
-def on_starting(server):
-    # Parse command line arguments
-    proc_name = server.cfg.default_proc_name
-    kwargs = {}
-    if proc_name.startswith("wsgi:app"):
-        str_args = re.sub(r'wsgi:app\s*\(\s*(.*)\s*\)', '\\1', proc_name).strip().split(",")
-        for a in str_args:
-            if "=" in a:
-                k,v = a.split("=")
-                k = k.strip()
-                v = v.strip()
-
-                if v.lower() in ["true", "false"]:
-                    v = v.lower() == "true"
-                    if not v:
-                        continue
-                elif v[0] == '"':
-                    v = v[1:-1]
-                kwargs[k] = v
-
-    from libretranslate.main import get_args
-    sys.argv = ['--wsgi']
-
-    for k in kwargs:
-        ck = k.replace("_", "-")
-        if isinstance(kwargs[k], bool) and kwargs[k]:
-            sys.argv.append("--" + ck)
-        else:
-            sys.argv.append("--" + ck)
-            sys.argv.append(kwargs[k])
-
-    args = get_args()
-
-    from libretranslate import flood, scheduler, secret, storage
-    storage.setup(args.shared_storage)
-    scheduler.setup(args)
-    flood.setup(args)
-    secret.setup(args)
\ No newline at end of file
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Health check for LibreTranslate Marathi service.
-Tests English → Marathi translation.
+Queries /health, which reports model readiness and recent inference
+without spending model time on a synthetic translation.
 """
 
 import requests
@@ -9,31 +10,19 @@ import os
 import sys
 
 def check_health():
-    """Perform health check by testing translation."""
+    """Perform health check against the /health endpoint."""
     port = os.environ.get('PORT', os.environ.get('LT_PORT', '5000'))
-    url = f'http://localhost:{port}/translate'
+    url = f'http://localhost:{port}/health'
     
     try:
-        # Test English to Marathi translation
-        response = requests.post(
-            url=url,
-            headers={'Content-Type': 'application/json'},
-            json={
-                'q': 'Hello',
-                'source': 'en',
-                'target': 'mr'
-            },
-            timeout=30
-        )
-        response.raise_for_status()
-        
-        # Verify response structure
+        response = requests.get(url=url, timeout=5)
         data = response.json()
-        if 'translatedText' not in data:
-            print("✗ Health check failed: No translatedText in response")
+        
+        if response.status_code != 200:
+            print(f"✗ Health check failed: {data.get('status')} (model {data.get('model_status')}, {data.get('error')})")
             return False
         
-        print(f"✓ Health check passed: '{data['translatedText']}'")
+        print(f"✓ Health check passed: last inference {data.get('last_inference_seconds_ago')}s ago")
         return True
         
     except requests.exceptions.Timeout:
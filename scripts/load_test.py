@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Load test for /translate, in-process or against a running server.
+
+Drives the API with a configurable request mix (single strings, lists,
+long paragraphs, dictionary hits) either closed-loop (--concurrency clients
+sending back to back) or open-loop (--rate requests per second with Poisson
+arrivals, latency measured from the scheduled arrival so queueing is not
+hidden). Prints a JSON report with p50/p95/p99 latency, throughput and error
+rate per request kind, for comparing runs across commits.
+
+    python scripts/load_test.py --concurrency 8 --duration 30
+    python scripts/load_test.py --url http://localhost:7860 --rate 20 --mix single=60,list=20,dictionary=20
+    python scripts/load_test.py --verify --requests 0        # dictionary correctness only
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SENTENCES = [
+    "Hello, how are you?",
+    "Please save your changes before you log out.",
+    "Your booking has been confirmed for tomorrow morning.",
+    "The driver will arrive at the pickup location in ten minutes.",
+    "Thank you for using our service.",
+    "We could not process your payment. Please try again.",
+    "Notifications are turned off for this event.",
+    "Search for events near you and invite your friends.",
+    "The meeting has been moved to Thursday afternoon at three o'clock.",
+    "Your password must contain at least eight characters, including a number.",
+    "Download the latest version of the app to get new features and bug fixes.",
+    "If you did not request this change, please contact support immediately.",
+]
+
+DEFAULT_MIX = "single=50,list=20,paragraph=10,dictionary=20"
+
+# Dictionary entries with exact expected outputs, checked by --verify
+VERIFY_CASES = [
+    ("Home", "घर"),
+    ("Profile", "प्रोफाइल"),
+    ("Settings", "सेटिंग्स"),
+    ("Driver", "चालक"),
+    ("Host", "यजमान"),
+    ("Events", "कार्यक्रम"),
+    ("Login", "लॉगिन"),
+    ("Logout", "लॉगआउट"),
+    ("Welcome", "स्वागत"),
+    ("Search", "शोधा"),
+]
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def summarize(latencies, errors, rejected, elapsed):
+    total = len(latencies) + errors + rejected
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        # 429s from admission control, reported apart from failures
+        "rejected": rejected,
+        "rejected_rate": round(rejected / total, 4) if total else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2) if latencies else None,
+            "p95": round(percentile(latencies, 0.95), 2) if latencies else None,
+            "p99": round(percentile(latencies, 0.99), 2) if latencies else None,
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "max": round(max(latencies), 2) if latencies else None,
+        }
+    }
+
+
+class Workload:
+    """Builds /translate payloads for each request kind"""
+
+    def __init__(self, mix, source, target, corpus, dictionary, unique, seed):
+        self.kinds = []
+        self.weights = []
+        for part in mix.split(','):
+            kind, weight = part.split('=')
+            if kind not in ('single', 'list', 'paragraph', 'dictionary'):
+                raise ValueError(f"Unknown request kind: {kind}")
+            self.kinds.append(kind)
+            self.weights.append(float(weight))
+
+        self.source = source
+        self.target = target
+        self.corpus = corpus
+        self.dictionary = dictionary or corpus
+        self.unique = unique
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counter = 0
+
+    def _sentence(self):
+        text = self.random.choice(self.corpus)
+        if self.unique:
+            # Defeat the translation cache and request coalescing
+            self.counter += 1
+            text = f"{text} ({self.counter})"
+        return text
+
+    def next(self):
+        """Return (kind, payload, item count)"""
+        with self.lock:
+            kind = self.random.choices(self.kinds, self.weights)[0]
+            if kind == 'single':
+                q = self._sentence()
+            elif kind == 'list':
+                q = [self._sentence() for _ in range(self.random.randint(8, 32))]
+            elif kind == 'paragraph':
+                q = " ".join(self._sentence() for _ in range(self.random.randint(10, 30)))
+            else:
+                q = self.random.choice(self.dictionary)
+        payload = {"q": q, "source": self.source, "target": self.target}
+        return kind, payload, len(q) if isinstance(q, list) else 1
+
+
+class InProcessClient:
+    """Calls the Flask app directly, one test client per thread"""
+
+    def __init__(self):
+        # Every request comes from this one client; do not throttle it
+        os.environ.setdefault('API_KEY_MAX_CONCURRENCY', '0')
+        sys.path.append(ROOT)
+        os.chdir(ROOT)
+        import app
+        self.app = app
+        self.local = threading.local()
+
+        app.model_loader.run()
+        if app.model_loader.status != "ready":
+            raise RuntimeError(f"Model failed to load: {app.model_loader.error}")
+
+    def post(self, payload):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.app.test_client()
+        response = client.post('/translate', json=payload)
+        return response.status_code
+
+    def translate(self, payload):
+        """Return (status, JSON body)"""
+        response = self.app.app.test_client().post('/translate', json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    def __init__(self, url, timeout, api_key=None):
+        self.url = url.rstrip('/') + '/translate'
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json'}
+        if api_key:
+            self.headers['X-API-Key'] = api_key
+
+    def post(self, payload):
+        return self.translate(payload)[0]
+
+    def translate(self, payload):
+        """Return (status, JSON body)"""
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode('utf-8'),
+            headers=self.headers
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            return e.code, None
+        try:
+            return status, json.loads(body)
+        except ValueError:
+            return status, None
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.rejected = {}
+        self.items = 0
+
+    def record(self, kind, latency_ms, status, items):
+        with self.lock:
+            if status == 200:
+                self.latencies.setdefault(kind, []).append(latency_ms)
+                self.items += items
+            elif status == 429:
+                self.rejected[kind] = self.rejected.get(kind, 0) + 1
+            else:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def send(client, recorder, workload, scheduled_at=None):
+    kind, payload, items = workload.next()
+    started = scheduled_at if scheduled_at is not None else time.perf_counter()
+    try:
+        status = client.post(payload)
+    except Exception:
+        status = None
+    recorder.record(kind, (time.perf_counter() - started) * 1000.0, status, items)
+
+
+def run_closed_loop(client, recorder, workload, concurrency, deadline, max_requests):
+    remaining = [max_requests]
+    lock = threading.Lock()
+
+    def worker():
+        while time.perf_counter() < deadline:
+            with lock:
+                if remaining[0] is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+            send(client, recorder, workload)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_open_loop(client, recorder, workload, rate, deadline, max_requests, max_in_flight, seed):
+    arrivals = random.Random(seed + 1)
+    sent = 0
+    next_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        while next_at < deadline and (max_requests is None or sent < max_requests):
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, client, recorder, workload, next_at)
+            sent += 1
+            next_at += arrivals.expovariate(rate)
+
+
+def verify(client):
+    """Check the known dictionary translations, returns {passed, failed}"""
+    failed = []
+    for text, expected in VERIFY_CASES:
+        status, data = client.translate({"q": text, "source": "en", "target": "mr"})
+        translated = (data or {}).get("translatedText")
+        if status != 200 or translated != expected:
+            failed.append({"q": text, "expected": expected, "status": status, "translatedText": translated})
+    return {"passed": len(VERIFY_CASES) - len(failed), "failed": failed}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_dictionary_phrases(source, target):
+    path = os.path.join(ROOT, 'translations_dict.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return list(data.get(f"{source}_to_{target}", {}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the translation API")
+    parser.add_argument('--url', type=str, default=None, help="Server to test (default: the app in-process)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Closed-loop clients")
+    parser.add_argument('--rate', type=float, default=0, help="Open-loop arrivals per second (overrides --concurrency)")
+    parser.add_argument('--max-in-flight', type=int, default=256, help="Open-loop limit on outstanding requests")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds to run")
+    parser.add_argument('--requests', type=int, default=None, help="Stop after this many requests")
+    parser.add_argument('--warmup', type=int, default=5, help="Requests sent before measuring")
+    parser.add_argument('--mix', type=str, default=DEFAULT_MIX, help="Request kinds and weights")
+    parser.add_argument('--source', type=str, default='en')
+    parser.add_argument('--target', type=str, default='mr')
+    parser.add_argument('--corpus', type=str, default=None, help="Text file with one sentence per line")
+    parser.add_argument('--unique', action='store_true', help="Make every sentence unique (no cache hits)")
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--api-key', type=str, default=None,
+                        help="Sent as X-API-Key; when the server sets API_KEY_MAX_CONCURRENCY, list it in API_KEYS "
+                             "and keep --concurrency within the limit")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=str, default=None, help="Write the JSON report here")
+    parser.add_argument('--verify', action='store_true',
+                        help="Check known dictionary translations first; exit 1 if any differ")
+    args = parser.parse_args()
+    # The in-process client changes directory to the repo root
+    if args.output:
+        args.output = os.path.abspath(args.output)
+
+    corpus = SENTENCES
+    if args.corpus:
+        with open(args.corpus, 'r', encoding='utf-8') as f:
+            corpus = [line.strip() for line in f if line.strip()]
+
+    workload = Workload(
+        args.mix, args.source, args.target, corpus,
+        load_dictionary_phrases(args.source, args.target), args.unique, args.seed
+    )
+    # Keep stdout for the report; the in-process app logs with print()
+    with contextlib.redirect_stdout(sys.stderr):
+        client = HttpClient(args.url, args.timeout, args.api_key) if args.url else InProcessClient()
+        verification = verify(client) if args.verify else None
+
+        for _ in range(args.warmup):
+            send(client, Recorder(), workload)
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        if args.rate:
+            run_open_loop(client, recorder, workload, args.rate, deadline, args.requests, args.max_in_flight, args.seed)
+        else:
+            run_closed_loop(client, recorder, workload, args.concurrency, deadline, args.requests)
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [latency for latencies in recorder.latencies.values() for latency in latencies]
+    report = {
+        "commit": git_commit(),
+        "target": args.url or "in-process",
+        "mode": "open-loop" if args.rate else "closed-loop",
+        "config": {
+            "concurrency": None if args.rate else args.concurrency,
+            "rate": args.rate or None,
+            "duration": args.duration,
+            "mix": args.mix,
+            "unique": args.unique,
+            "source": args.source,
+            "target": args.target,
+            "seed": args.seed
+        },
+        "verify": verification,
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(all_latencies, sum(recorder.errors.values()), sum(recorder.rejected.values()), elapsed),
+        "items_per_s": round(recorder.items / elapsed, 2) if elapsed else 0.0,
+        "by_kind": {
+            kind: summarize(
+                recorder.latencies.get(kind, []), recorder.errors.get(kind, 0), recorder.rejected.get(kind, 0), elapsed
+            )
+            for kind in workload.kinds
+        }
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    if verification and verification["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Deterministic micro-benchmarks of the translation paths, no checkpoint needed.
+
+Builds a tiny randomly initialized M2M100 model (the architecture family of
+IndicTrans2) with a word-level tokenizer in a temporary directory, points
+the app's model registry at it and times the dictionary, cache, scheduler,
+batch and /translate paths. Seeds and torch thread counts are fixed, so runs
+on the same machine are comparable; runs on different machines are not.
+
+    python scripts/microbench.py --save                  # write the baseline
+    python scripts/microbench.py --compare               # exit 1 on regressions
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "microbench-baseline.json")
+
+SEED = 1234
+
+SENTENCES = [
+    "Please save your changes before you log out.",
+    "Your booking has been confirmed for tomorrow morning.",
+    "The driver will arrive at the pickup location in ten minutes.",
+    "We could not process your payment. Please try again.",
+    "Search for events near you and invite your friends.",
+    "The meeting has been moved to Thursday afternoon at three o'clock.",
+    "Your password must contain at least eight characters, including a number.",
+    "If you did not request this change, please contact support immediately.",
+]
+
+# Output side of the vocabulary, so decoded text goes through Devanagari postprocessing
+MARATHI_WORDS = "कृपया तुमचे बदल जतन करा चालक घर कार्यक्रम स्वागत शोधा आज उद्या सकाळी".split()
+
+
+def build_tiny_model(model_dir, seed):
+    """Save a small M2M100 model and fast tokenizer with IndicTrans2's language tags"""
+    import torch
+    from tokenizers import AddedToken, Tokenizer, models, normalizers, pre_tokenizers, processors
+    from transformers import M2M100Config, M2M100ForConditionalGeneration, PreTrainedTokenizerFast
+
+    language_tags = ["eng_Latn", "mar_Deva"]
+    placeholders = [f"<ID{n}>" for n in range(16)]
+    vocab = {"<pad>": 0, "<s>": 1, "</s>": 2, "<unk>": 3}
+    words = " ".join(SENTENCES).lower().replace(".", " . ").replace(",", " , ").split() + MARATHI_WORDS
+    for word in language_tags + placeholders + words + [str(n) for n in range(10)]:
+        vocab.setdefault(word, len(vocab))
+
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.normalizer = normalizers.Lowercase()
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    # Matched before lowercasing and splitting, so tags and placeholders stay
+    # whole; placeholders are not special, decoding keeps them for restoring
+    backend.add_special_tokens([AddedToken(tag, normalized=False) for tag in language_tags])
+    backend.add_tokens([AddedToken(placeholder, normalized=False) for placeholder in placeholders])
+    backend.post_processor = processors.TemplateProcessing(single="$A </s>", special_tokens=[("</s>", 2)])
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend,
+        pad_token="<pad>", bos_token="<s>", eos_token="</s>", unk_token="<unk>",
+        model_input_names=["input_ids", "attention_mask"]
+    )
+    tokenizer.save_pretrained(model_dir)
+
+    torch.manual_seed(seed)
+    config = M2M100Config(
+        vocab_size=len(vocab),
+        d_model=64,
+        encoder_layers=2,
+        decoder_layers=2,
+        encoder_attention_heads=4,
+        decoder_attention_heads=4,
+        encoder_ffn_dim=128,
+        decoder_ffn_dim=128,
+        max_position_embeddings=512,
+        pad_token_id=0,
+        bos_token_id=1,
+        eos_token_id=2,
+        decoder_start_token_id=2
+    )
+    M2M100ForConditionalGeneration(config).eval().save_pretrained(model_dir)
+
+
+def setup_app(model_dir, threads):
+    """Import the app with the tiny model as every direction's checkpoint"""
+    from pathlib import Path
+
+    # Before importing app: no disk cache, dictionary watcher or job workers
+    os.environ.pop('CACHE_DIR', None)
+    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    os.environ['DICT_WATCH_SECONDS'] = '0'
+    os.environ['JOB_WORKERS'] = '0'
+    os.environ['INFERENCE_BACKEND'] = 'torch'
+    os.environ['QUANTIZE'] = ''
+
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+    sys.path.append(ROOT)
+    os.chdir(ROOT)
+    import app
+    for direction in app.MODEL_DIRS:
+        app.MODEL_DIRS[direction] = Path(model_dir)
+    app.load_translations_dict()
+    app.load_model()
+    return app
+
+
+def define_benchmarks(app):
+    """name -> (setup, run); setup is untimed and runs before every iteration"""
+    client = app.app.test_client()
+    cached_key = app.cache_key(SENTENCES[0], "en", "mr", "best")
+
+    def no_setup():
+        pass
+
+    def clear_caches():
+        app.translation_cache.clear()
+        app._preprocess.cache_clear()
+        app._postprocess.cache_clear()
+
+    def warm_cache():
+        app.translation_cache.put(cached_key, "जतन करा")
+
+    def scheduler_concurrent():
+        results = [None] * len(SENTENCES)
+
+        def worker(i):
+            results[i] = app.translate_with_indictrans2(SENTENCES[i], "en", "mr", "fast")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(SENTENCES))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    return {
+        "dictionary_hit": (no_setup, lambda: app.translate_with_dict("Settings", "en", "mr")),
+        "cache_hit": (warm_cache, lambda: app.translate_with_dict(SENTENCES[0], "en", "mr", "best")),
+        "preprocess_batch": (clear_caches, lambda: app.preprocess_batch(SENTENCES, "en")),
+        "translate_with_indictrans2": (no_setup, lambda: app.translate_with_indictrans2(SENTENCES[1], "en", "mr", "best")),
+        "scheduler_concurrent": (no_setup, scheduler_concurrent),
+        "translate_batch": (
+            clear_caches, lambda: app.translate_batch_with_indictrans2(SENTENCES * 4, "en", "mr", "balanced")
+        ),
+        "translate_view": (
+            clear_caches,
+            lambda: client.post('/translate', json={"q": SENTENCES, "source": "en", "target": "mr"}).get_json()["translatedText"]
+        ),
+    }
+
+
+def run_benchmark(setup, run, warmup, repeat):
+    for _ in range(warmup):
+        setup()
+        result = run()
+    samples = []
+    for _ in range(repeat):
+        setup()
+        started = time.perf_counter()
+        result = run()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    samples.sort()
+    quartiles = statistics.quantiles(samples, n=4) if len(samples) > 1 else [samples[0]] * 3
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(samples[0], 4),
+        "iqr_ms": round(quartiles[2] - quartiles[0], 4),
+        "repeat": repeat,
+        # Changes when the work itself changed (outputs, batching), not just its speed
+        "output_sha1": hashlib.sha1(repr(result).encode("utf-8")).hexdigest()[:12]
+    }
+
+
+def environment(threads):
+    import torch
+    import transformers
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "threads": threads
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print current vs baseline medians, returns the names of regressed benchmarks"""
+    regressions = []
+    if baseline.get("environment") != results["environment"]:
+        print("⚠ Baseline was recorded in a different environment; timings may not be comparable")
+    print(f"{'benchmark':<28}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            print(f"{name:<28}{'-':>12}{current['median_ms']:>12.3f}{'new':>10}")
+            continue
+        change = current["median_ms"] / previous["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  ✗ regression"
+            regressions.append(name)
+        elif previous.get("output_sha1") != current["output_sha1"]:
+            flag = "  ⚠ output changed"
+        print(f"{name:<28}{previous['median_ms']:>12.3f}{current['median_ms']:>12.3f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic micro-benchmarks with a tiny random model")
+    parser.add_argument('--threads', type=int, default=1, help="torch intra-op threads")
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--only', type=str, default=None, help="Comma separated benchmark names")
+    parser.add_argument('--save', type=str, nargs='?', const=DEFAULT_BASELINE, default=None, help="Write results as the baseline")
+    parser.add_argument('--compare', type=str, nargs='?', const=DEFAULT_BASELINE, default=None, help="Compare against a baseline")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Median slowdown counted as a regression")
+    parser.add_argument('--output', type=str, default=None, help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    # Thread pools size themselves from these when torch is first imported
+    for name in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[name] = str(args.threads)
+    random.seed(SEED)
+
+    model_dir = tempfile.mkdtemp(prefix="microbench-model-")
+    try:
+        build_tiny_model(model_dir, SEED)
+        app = setup_app(model_dir, args.threads)
+        benchmarks = define_benchmarks(app)
+        if args.only:
+            names = args.only.split(',')
+            benchmarks = {name: benchmarks[name] for name in names}
+
+        results = {"environment": environment(args.threads), "benchmarks": {}}
+        for name, (setup, run) in benchmarks.items():
+            import torch
+            torch.manual_seed(SEED)
+            results["benchmarks"][name] = run_benchmark(setup, run, args.warmup, args.repeat)
+            print(f"  • {name}: {results['benchmarks'][name]['median_ms']:.3f} ms")
+    finally:
+        shutil.rmtree(model_dir, ignore_errors=True)
+
+    for path in (args.save, args.output):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+                f.write('\n')
+            print(f"✓ Wrote {path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✓ No regressions")
+
+
+if __name__ == "__main__":
+    main()
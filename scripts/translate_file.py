@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Translate a JSONL or TSV file offline, without the HTTP server.
+
+JSONL records need a "q" field and may carry their own "source"/"target"
+(as written by scripts/suggestions-to-jsonl.py); each output record is the
+input record plus "translatedText". TSV lines are source text in the first
+column; the translation is appended as a new last column.
+
+Inputs are deduplicated across the run, sent to worker processes in chunks
+and translated dictionary first, then through the app's batch scheduler at
+bulk priority.
+Output is written in input order as chunks finish, and a checkpoint next to
+the output file lets an interrupted run resume where it stopped.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+# Set in each worker process by init_worker()
+app = None
+
+
+def init_worker(threads):
+    global app
+    os.chdir(ROOT)
+
+    import torch
+    torch.set_num_threads(threads)
+
+    import app as app_module
+    app = app_module
+    app.load_translations_dict()
+    app.load_model()
+
+
+def translate_unique(items, quality):
+    """
+    Translate (source, target, text) items, returns translations in order
+    A failed model batch raises, so its chunk is never written or checkpointed
+    """
+    translations = [None] * len(items)
+    by_pair = {}
+    for i, (source, target, text) in enumerate(items):
+        if not text.strip():
+            translations[i] = ""
+            continue
+        translated = app.lookup_dict(text, source, target)
+        if translated is not None:
+            translations[i] = translated
+            continue
+        by_pair.setdefault((source, target), []).append(i)
+
+    for (source, target), indices in by_pair.items():
+        texts = [items[i][2] for i in indices]
+        outputs = app.translate_batch_with_indictrans2(texts, source, target, quality)
+        for i, output in zip(indices, outputs):
+            translations[i] = output
+    return translations
+
+
+def read_records(path, skip, default_source, default_target):
+    """Yield (line, source, target, text) for every input line after the first skip"""
+    is_jsonl = path.endswith('.jsonl') or path.endswith('.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        for n, line in enumerate(f):
+            if n < skip:
+                continue
+            line = line.rstrip('\n')
+            if is_jsonl:
+                record = json.loads(line) if line.strip() else {}
+                text = record.get('q') or ''
+                source = record.get('source') or default_source
+                target = record.get('target') or default_target
+                yield record, source, target, text
+            else:
+                yield line, default_source, default_target, line.split('\t', 1)[0]
+
+
+def format_record(record, translation):
+    if isinstance(record, dict):
+        if not record:
+            return '\n'
+        return json.dumps(dict(record, translatedText=translation), ensure_ascii=False) + '\n'
+    return record + '\t' + translation.replace('\t', ' ').replace('\n', ' ') + '\n'
+
+
+def read_chunks(records, chunk_size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_checkpoint(path, input_path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get('input') != os.path.abspath(input_path):
+        print(f"⚠ Ignoring {path}: written for {checkpoint.get('input')}")
+        return None
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    cores = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description="Offline bulk translation of JSONL/TSV files")
+    parser.add_argument('input', type=str, help="JSONL ({q, source, target} records) or TSV file")
+    parser.add_argument('--output', type=str, default=None, help="Defaults to <input>.translated.<ext>")
+    parser.add_argument('--source', type=str, default='en', help="Source language for records without one")
+    parser.add_argument('--target', type=str, default='mr', help="Target language for records without one")
+    parser.add_argument('--quality', type=str, default='best', choices=['auto', 'fast', 'balanced', 'best'])
+    parser.add_argument('--workers', type=int, default=max(1, cores // 4), help="Worker processes, each with its own model")
+    parser.add_argument('--threads', type=int, default=0, help="torch threads per worker (default: cores / workers)")
+    parser.add_argument('--chunk-size', type=int, default=1024, help="Input lines per chunk and checkpoint")
+    parser.add_argument('--dedup-entries', type=int, default=1000000, help="Translations remembered for deduplication")
+    parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+
+    # Absolute before the chdir below, which relative paths would not survive
+    input_path = os.path.abspath(args.input)
+    root, ext = os.path.splitext(input_path)
+    output_path = os.path.abspath(args.output) if args.output else f"{root}.translated{ext}"
+    checkpoint_path = output_path + '.checkpoint'
+    threads = args.threads or max(1, cores // args.workers)
+
+    checkpoint = None if args.restart else load_checkpoint(checkpoint_path, input_path)
+    done = checkpoint['lines'] if checkpoint else 0
+    if checkpoint:
+        print(f"Resuming after line {done}")
+        output = open(output_path, 'r+', encoding='utf-8')
+        output.seek(checkpoint['output_bytes'])
+        output.truncate()
+    else:
+        output = open(output_path, 'w', encoding='utf-8')
+
+    # The parent only uses the cache helpers; models are loaded in the workers
+    os.chdir(ROOT)
+    import app as app_module
+    seen = app_module.TranslationCache(max_entries=args.dedup_entries, max_bytes=sys.maxsize)
+
+    print(f"Translating {input_path} -> {output_path} ({args.workers} workers x {threads} threads)")
+    context = multiprocessing.get_context('spawn')
+    pool = context.Pool(args.workers, initializer=init_worker, initargs=(threads,))
+    in_flight = deque()
+    started = time.perf_counter()
+    translated = 0
+    deduplicated = 0
+
+    def write_chunk(chunk, unique_keys, result):
+        nonlocal done
+        translations = dict(zip(unique_keys, result.get()))
+        for key, translation in translations.items():
+            seen.put(key, translation)
+        for record, text, key, known in chunk:
+            translation = translations.get(key, known)
+            output.write(format_record(record, translation if translation is not None else text))
+        output.flush()
+        os.fsync(output.fileno())
+        done += len(chunk)
+        save_checkpoint(checkpoint_path, {
+            "input": input_path,
+            "lines": done,
+            "output_bytes": output.tell()
+        })
+
+    try:
+        records = read_records(input_path, done, args.source, args.target)
+        for chunk in read_chunks(records, args.chunk_size):
+            keyed = []
+            unique = {}
+            for record, source, target, text in chunk:
+                key = None
+                known = None
+                if source in app_module.LANG_CODE_MAP and target in app_module.LANG_CODE_MAP and source != target:
+                    key = app_module.cache_key(text, source, target, args.quality)
+                    # Taken now: later chunks may evict it from seen before this one is written
+                    known = seen.get(key)
+                    if key not in unique and known is None:
+                        unique[key] = (source, target, text)
+                    else:
+                        deduplicated += 1
+                keyed.append((record, text, key, known))
+
+            unique_keys = list(unique)
+            in_flight.append((keyed, unique_keys, pool.apply_async(translate_unique, (list(unique.values()), args.quality))))
+            translated += len(unique_keys)
+
+            # Keep every worker busy while writing finished chunks in input order
+            while len(in_flight) > args.workers * 2 or (in_flight and in_flight[0][2].ready()):
+                write_chunk(*in_flight.popleft())
+                elapsed = time.perf_counter() - started
+                print(f"  {done} lines, {translated} translated, {deduplicated} deduplicated ({translated / elapsed:.1f}/s)")
+
+        while in_flight:
+            write_chunk(*in_flight.popleft())
+    except Exception as e:
+        print(f"✗ Translation failed after line {done}: {e}", file=sys.stderr)
+        print("  Run the same command again to resume from the last checkpoint", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        pool.terminate()
+        output.close()
+
+    # Not written when there was nothing (left) to translate
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    elapsed = time.perf_counter() - started
+    print()
+    print(f"✓ {done} lines in {elapsed:.1f}s ({translated} translated, {deduplicated} deduplicated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Glossary phrase matching, no model checkpoint needed.
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Before importing app: no dictionary watcher or job workers
+os.environ['DICT_WATCH_SECONDS'] = '0'
+os.environ['JOB_WORKERS'] = '0'
+sys.path.insert(0, ROOT)
+
+from app import GlossaryMatcher  # noqa: E402
+
+PHRASES = {
+    "home": "घर",
+    "settings": "सेटिंग्स",
+    "account": "खाते",
+    "delete": "हटवा",
+    "account settings": "खाते सेटिंग्ज",
+}
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return GlossaryMatcher(PHRASES)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Home / Settings", "घर / सेटिंग्स"),
+    ("Home | Settings", "घर | सेटिंग्स"),
+    ("Home, Settings; Account", "घर, सेटिंग्स; खाते"),
+    ("Home\nSettings", "घर\nसेटिंग्स"),
+    ("Home · Settings", "घर · सेटिंग्स"),
+])
+def test_separated_labels_are_substituted(matcher, text, expected):
+    assert matcher.translate_covered(text) == expected
+
+
+@pytest.mark.parametrize("text", ["Delete account", "Home settings", "Open Settings"])
+def test_space_separated_phrases_go_to_the_model(matcher, text):
+    assert matcher.translate_covered(text) is None
+
+
+def test_longest_phrase_wins(matcher):
+    assert matcher.translate_covered("Account Settings") == "खाते सेटिंग्ज"
+    assert matcher.translate_covered("Account Settings / Home") == "खाते सेटिंग्ज / घर"
+
+
+@pytest.mark.parametrize("text", ["home", "HOME", "Home", "hOmE"])
+def test_matching_ignores_case(matcher, text):
+    assert matcher.translate_covered(text) == "घर"
+
+
+def test_outer_punctuation_is_kept(matcher):
+    assert matcher.translate_covered("  Home.  ") == "घर."
+
+
+def test_danda_separates_marathi_labels():
+    marathi = GlossaryMatcher({"घर": "home", "प्रोफाइल": "profile"})
+    assert marathi.translate_covered("घर।") == "home।"
+    assert marathi.translate_covered("घर। प्रोफाइल") == "home। profile"
+    assert marathi.translate_covered("घर प्रोफाइल") is None
+
+
+def test_state_round_trip(matcher):
+    restored = GlossaryMatcher.from_state(matcher.to_state())
+    assert restored.translate_covered("Home / Account Settings") == "घर / खाते सेटिंग्ज"
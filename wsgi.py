@@ -0,0 +1,30 @@
+"""
+WSGI entry point for production:
+
+    gunicorn -c scripts/gunicorn_conf.py wsgi:app
+
+With preload_app the master loads the dictionary and model once, then forks
+the workers, which share the weights copy-on-write.
+"""
+
+import gc
+
+import torch
+
+import app as translation_app
+
+# The master must not start an intra-op thread pool before forking; each
+# worker sets its own thread count in post_fork (scripts/gunicorn_conf.py)
+torch.set_num_threads(1)
+
+# Load without warming up: the warmup runs in each worker (post_fork)
+translation_app.model_loader.run(warmup=False)
+if translation_app.model_loader.status == "failed":
+    raise RuntimeError(f"Failed to load model: {translation_app.model_loader.error}")
+
+# Keep the garbage collector from touching (and so copying) the objects
+# loaded above in every worker
+gc.collect()
+gc.freeze()
+
+app = translation_app.app